@@ -1,10 +1,10 @@
 import argparse
+import functools
 import sys
 from pathlib import Path
 import logging
 from ..core.models import ModProject
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def create_parser() -> argparse.ArgumentParser:
@@ -33,73 +33,82 @@ def create_parser() -> argparse.ArgumentParser:
 
     return parser
 
+def _require_exists(attr: str):
+    """Make a command handler fail early if its input file is missing."""
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(args):
+            input_path = Path(getattr(args, attr))
+            if not input_path.exists():
+                logger.error(f"Input file not found: {input_path}")
+                return 1
+            return handler(args, input_path)
+        return wrapper
+    return decorator
+
+@_require_exists('modinfo')
+def _cmd_modinfo2proj(args, input_path: Path) -> int:
+    project = ModProject.from_modinfo(input_path)
+    
+    output_path = Path(args.output) if args.output else input_path.with_suffix('.civ5proj')
+    project.write_civ5proj(output_path, create_solution=not args.no_solution)
+    logger.info(f"Successfully converted {input_path} to {output_path}")
+    if not args.no_solution:
+        logger.info(f"Created/updated solution file: {output_path.with_suffix('.civ5sln')}")
+    return 0
+
+@_require_exists('civ5proj')
+def _cmd_proj2modinfo(args, input_path: Path) -> int:
+    project = ModProject.from_civ5proj(input_path)
+    
+    output_path = Path(args.output) if args.output else input_path.with_suffix('.modinfo')
+    project.write_modinfo(output_path, input_path.parent)
+    logger.info(f"Successfully converted {input_path} to {output_path}")
+    return 0
+
+@_require_exists('file')
+def _cmd_validate(args, input_path: Path) -> int:
+    # Try to load the file to validate it
+    if input_path.suffix.lower() == '.modinfo':
+        ModProject.from_modinfo(input_path)
+        logger.info(f"Successfully validated {input_path} as .modinfo")
+    elif input_path.suffix.lower() == '.civ5proj':
+        ModProject.from_civ5proj(input_path)
+        logger.info(f"Successfully validated {input_path} as .civ5proj")
+    else:
+        logger.error(f"Unsupported file type: {input_path.suffix}")
+        return 1
+    return 0
+
+@_require_exists('modinfo')
+def _cmd_update_md5(args, input_path: Path) -> int:
+    project = ModProject.from_modinfo(input_path)
+    
+    # Update MD5 hashes, rehashing every file rather than trusting the cache
+    output_path = Path(args.output) if args.output else input_path
+    project.write_modinfo(output_path, input_path.parent, rehash=True)
+    logger.info(f"Successfully updated MD5 hashes in {output_path}")
+    return 0
+
+_HANDLERS = {
+    'modinfo2proj': _cmd_modinfo2proj,
+    'proj2modinfo': _cmd_proj2modinfo,
+    'validate': _cmd_validate,
+    'update-md5': _cmd_update_md5,
+}
+
 def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
     parser = create_parser()
     args = parser.parse_args(argv)
 
-    if not args.command:
+    handler = _HANDLERS.get(args.command)
+    if handler is None:
         parser.print_help()
         return
 
     try:
-        if args.command == 'modinfo2proj':
-            input_path = Path(args.modinfo)
-            if not input_path.exists():
-                logger.error(f"Input file not found: {input_path}")
-                return 1
-
-            project = ModProject.from_modinfo(input_path)
-            
-            output_path = Path(args.output) if args.output else input_path.with_suffix('.civ5proj')
-            project.write_civ5proj(output_path, create_solution=not args.no_solution)
-            logger.info(f"Successfully converted {input_path} to {output_path}")
-            if not args.no_solution:
-                logger.info(f"Created/updated solution file: {output_path.with_suffix('.civ5sln')}")
-
-        elif args.command == 'proj2modinfo':
-            input_path = Path(args.civ5proj)
-            if not input_path.exists():
-                logger.error(f"Input file not found: {input_path}")
-                return 1
-
-            project = ModProject.from_civ5proj(input_path)
-            
-            output_path = Path(args.output) if args.output else input_path.with_suffix('.modinfo')
-            project.write_modinfo(output_path, input_path.parent)
-            logger.info(f"Successfully converted {input_path} to {output_path}")
-
-        elif args.command == 'validate':
-            input_path = Path(args.file)
-            if not input_path.exists():
-                logger.error(f"Input file not found: {input_path}")
-                return 1
-
-            # Try to load the file to validate it
-            if input_path.suffix.lower() == '.modinfo':
-                project = ModProject.from_modinfo(input_path)
-                logger.info(f"Successfully validated {input_path} as .modinfo")
-            elif input_path.suffix.lower() == '.civ5proj':
-                project = ModProject.from_civ5proj(input_path)
-                logger.info(f"Successfully validated {input_path} as .civ5proj")
-            else:
-                logger.error(f"Unsupported file type: {input_path.suffix}")
-                return 1
-
-        elif args.command == 'update-md5':
-            input_path = Path(args.modinfo)
-            if not input_path.exists():
-                logger.error(f"Input file not found: {input_path}")
-                return 1
-
-            project = ModProject.from_modinfo(input_path)
-            
-            # Update MD5 hashes
-            output_path = Path(args.output) if args.output else input_path
-            project.write_modinfo(output_path, input_path.parent)
-            logger.info(f"Successfully updated MD5 hashes in {output_path}")
-
-        return 0
-
+        return handler(args)
     except Exception as e:
         logger.error(f"Error: {e}")
         return 1
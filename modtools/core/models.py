@@ -1,18 +1,156 @@
 """Core data models for Civilization V mod files."""
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from operator import itemgetter
+from typing import List, Optional
 from pathlib import Path
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
 import hashlib
+import io
+import json
+import mmap
 import os
+import sys
 import uuid
 import logging
-from .paths import normalize_game_path, normalize_system_path, paths_equal
+from .paths import normalize_game_path, normalize_system_path
+from .solution import ModSolution, ProjectReference
+
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:
+    _lxml_etree = None
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Read size used when hashing files (1 MiB)
+_MD5_CHUNK = 1 << 20
+
+# Files larger than this (4 MiB) are memory-mapped for hashing
+_MMAP_THRESHOLD = 4 << 20
+
+# Attribute value escapes beyond &, < and >, as ElementTree writes them
+_XML_ATTR_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#09;"}
+
+# Booleans as written in .civ5proj files
+_BOOL_LOWER = {True: "true", False: "false"}
+
+# The .civ5proj PropertyGroup holding the mod's properties. Kept free of
+# whitespace between elements so it pretty-prints like built elements.
+_CIV5PROJ_PROPERTIES_TEMPLATE = (
+    "<PropertyGroup>"
+    "<Configuration>Default</Configuration>"
+    "<ProjectGuid>{project_guid}</ProjectGuid>"
+    "<Name>{name}</Name>"
+    "<Guid>{mod_guid}</Guid>"
+    "<ModVersion>{version}</ModVersion>"
+    "<Stability>{stability}</Stability>"
+    "<Teaser>{teaser}</Teaser>"
+    "<Description>{description}</Description>"
+    "<Authors>{authors}</Authors>"
+    "<SpecialThanks>{special_thanks}</SpecialThanks>"
+    "<Homepage>{homepage}</Homepage>"
+    "<AffectsSavedGames>{affects_saves}</AffectsSavedGames>"
+    "<MinCompatibleSaveVersion>{min_save_version}</MinCompatibleSaveVersion>"
+    "<SupportsSinglePlayer>{supports_singleplayer}</SupportsSinglePlayer>"
+    "<SupportsMultiplayer>{supports_multiplayer}</SupportsMultiplayer>"
+    "<SupportsHotSeat>{supports_hotseat}</SupportsHotSeat>"
+    "<SupportsMac>{supports_mac}</SupportsMac>"
+    "<HideSetupGame>{hide_setup_game}</HideSetupGame>"
+    "<ReloadUnitSystem>{reload_unit}</ReloadUnitSystem>"
+    "<ReloadLandmarkSystem>{reload_landmark}</ReloadLandmarkSystem>"
+    "<ReloadStrategicViewSystem>{reload_strategic_view}</ReloadStrategicViewSystem>"
+    "</PropertyGroup>"
+)
+
+def _child_elements(elem):
+    """
+    Yield the child elements of elem.
+
+    lxml keeps unresolved entity references as children whose tag is not a
+    string; they are skipped.
+    """
+    for child in elem:
+        if isinstance(child.tag, str):
+            yield child
+
+def _children_by_tag(elem) -> dict:
+    """Map each child's tag, without namespace, to the first child with it."""
+    children = {}
+    for child in _child_elements(elem):
+        children.setdefault(child.tag.rpartition('}')[2], child)
+    return children
+
+def _local_children(elem, tag: str):
+    """Yield the children of elem with the given tag, ignoring namespace."""
+    for child in _child_elements(elem):
+        if child.tag.rpartition('}')[2] == tag:
+            yield child
+
+def _intern(text):
+    """Intern an often repeated value, such as an action or item type."""
+    return sys.intern(text) if text else text
+
+def _xml_lines(elem: ET.Element, indent: str, lines: List[str]):
+    """
+    Append elem as pretty-printed lines, matching ET.indent(space="  ").
+
+    Project trees hold either child elements or text, never both, and
+    unqualified tags, so each element formats straight to one or two lines.
+    """
+    tag = elem.tag
+    attrs = "".join(
+        f' {key}="{escape(value, _XML_ATTR_ENTITIES)}"' for key, value in elem.items()
+    ) if elem.attrib else ""
+    if len(elem):
+        lines.append(f"{indent}<{tag}{attrs}>")
+        child_indent = indent + "  "
+        for child in elem:
+            _xml_lines(child, child_indent, lines)
+        lines.append(f"{indent}</{tag}>")
+    elif elem.text:
+        lines.append(f"{indent}<{tag}{attrs}>{escape(elem.text)}</{tag}>")
+    else:
+        lines.append(f"{indent}<{tag}{attrs} />")
+
+def _xml_text(root: ET.Element) -> str:
+    """Pretty-print an element tree as a UTF-8 XML document."""
+    # Formatting lines directly is a few times faster than ET.indent
+    # followed by ElementTree.write, with byte-identical output
+    lines = ['<?xml version="1.0" encoding="utf-8"?>']
+    _xml_lines(root, "", lines)
+    lines.append("")
+    return "\n".join(lines)
+
+def _write_text(text: str, output_path: Path):
+    """Write text as UTF-8 with the platform's line endings (CRLF on Windows)."""
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def _iterparse_xml(source, events):
+    """
+    Iteratively parse an XML file, using lxml when it is installed.
+
+    source is a path or a binary file object.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = os.fspath(source)
+    if _lxml_etree is not None:
+        # lxml before 5.0 resolves external entities by default; never let
+        # a downloaded mod file pull in local files or network resources
+        return _lxml_etree.iterparse(source, events=events,
+                                     remove_comments=True, remove_pis=True,
+                                     resolve_entities=False, no_network=True)
+    return ET.iterparse(source, events=events)
+
+def _xml_source(data):
+    """Wrap an XML document held in memory as a binary file object."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return io.BytesIO(data)
+
+@dataclass(slots=True)
 class FileEntry:
     """Represents a file in the mod."""
     path: str
@@ -20,20 +158,40 @@ class FileEntry:
     type: str = ""  # SubType in civ5proj
     md5: Optional[str] = None
 
+    def __post_init__(self):
+        # Store paths in canonical game form, so loaders need not normalize
+        self.path = normalize_game_path(self.path)
+
     @staticmethod
     def calculate_md5(file_path: str) -> str:
         """Calculate MD5 hash of a file."""
         try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
+            # Large unbuffered reads: far fewer read()/update() round trips
+            # per file, and no copy through Python's read buffer
+            with open(file_path, "rb", buffering=0) as f:
+                if os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+                    # Hash large files straight from the page cache
+                    try:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            return hashlib.md5(mm).hexdigest().upper()
+                    except (OSError, ValueError):
+                        pass  # mmap unsupported here, read the file instead
+                if sys.version_info >= (3, 11):
+                    # Reads and hashes in C with the GIL released
+                    return hashlib.file_digest(f, "md5").hexdigest().upper()
+                hash_md5 = hashlib.md5()
+                read, update = f.read, hash_md5.update
+                for chunk in iter(lambda: read(_MD5_CHUNK), b""):
+                    update(chunk)
             return hash_md5.hexdigest().upper()
+        except FileNotFoundError:
+            logger.warning(f"File not found while calculating MD5: {file_path}")
+            return ""
         except Exception as e:
             logger.error(f"Error calculating MD5 for {file_path}: {e}")
             return ""
 
-@dataclass
+@dataclass(slots=True)
 class Association:
     """Represents a dependency or blocker association."""
     type: str  # "Game", "Dlc", or "Mod"
@@ -42,14 +200,14 @@ class Association:
     min_version: str = "0"
     max_version: str = "999"
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """Represents a mod action."""
     action_set: str  # e.g., "OnModActivated"
     action_type: str  # e.g., "UpdateDatabase"
     filename: str
 
-@dataclass
+@dataclass(slots=True)
 class EntryPoint:
     """Represents a mod entry point."""
     type: str
@@ -99,8 +257,72 @@ class ModProject:
         """Get minimum compatible save version, defaults to current version."""
         return self.min_save_version or self.version
 
-    def to_modinfo(self, base_path: Path) -> ET.Element:
-        """Convert to modinfo XML format."""
+    def _sorted_files(self) -> List[tuple]:
+        """Get (game path, file) pairs sorted by game path, normalizing each path once."""
+        # Paths are canonical when entries are created, but may have been
+        # reassigned since (the GUI edits them in place); normalizing a
+        # canonical path is a cache hit
+        pairs = [(normalize_game_path(f.path), f) for f in self.files]
+        pairs.sort(key=itemgetter(0))
+        return pairs
+
+    @staticmethod
+    def _md5_cache_path(base_path: Path) -> Path:
+        """Get the sidecar file caching MD5 hashes of a mod's files."""
+        return Path(base_path) / ".modtools-md5.json"
+
+    @staticmethod
+    def _load_md5_cache(cache_path: Path) -> dict:
+        """Load {game path: [size, mtime_ns, md5]}, or an empty cache."""
+        try:
+            with open(cache_path, encoding='utf-8') as f:
+                cache = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable MD5 cache {cache_path}: {e}")
+            return {}
+        if not isinstance(cache, dict):
+            logger.warning(f"Ignoring malformed MD5 cache {cache_path}")
+            return {}
+
+        # Drop malformed entries, e.g. from hand edits; those files are rehashed
+        def valid(entry):
+            return (isinstance(entry, list) and len(entry) == 3
+                    and all(type(n) is int for n in entry[:2])
+                    and isinstance(entry[2], str))
+
+        return {path: entry for path, entry in cache.items() if valid(entry)}
+
+    @staticmethod
+    def _save_md5_cache(cache_path: Path, cache: dict):
+        try:
+            with open(cache_path, "w", encoding='utf-8') as f:
+                json.dump(cache, f)
+        except OSError as e:
+            logger.warning(f"Could not write MD5 cache {cache_path}: {e}")
+
+    @staticmethod
+    def _hash_files(sys_paths) -> dict:
+        """Calculate MD5 hashes of files in parallel, keyed by path."""
+        sys_paths = list(dict.fromkeys(sys_paths))
+        if len(sys_paths) < 4:
+            # Not worth starting a pool for
+            return {p: FileEntry.calculate_md5(p) for p in sys_paths}
+        # Hashing and file reads release the GIL, so threads run in parallel
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return dict(zip(sys_paths, executor.map(FileEntry.calculate_md5, sys_paths)))
+
+    def to_modinfo(self, base_path: Path, md5_cache: Optional[dict] = None) -> ET.Element:
+        """
+        Convert to modinfo XML format.
+
+        md5_cache maps game paths to [size, mtime_ns, md5]. Hashes of files
+        unchanged since they were cached are reused, and new hashes are added
+        to it in place. Without a cache every VFS file is hashed.
+        """
+        if md5_cache is None:
+            md5_cache = {}
         root = ET.Element("Mod")
         root.set("id", self.mod_guid)
         root.set("version", self.version)
@@ -160,23 +382,53 @@ class ModProject:
         # Files
         if self.files:
             files = ET.SubElement(root, "Files")
-            for file in sorted(self.files, key=lambda x: normalize_game_path(x.path)):
-                file_elem = ET.SubElement(files, "File")
-                
+            sorted_files = self._sorted_files()
+
+            # Reuse hashes of files unchanged since they were cached, and hash
+            # the rest up front so the hashing can run in parallel
+            md5s = {}
+            stale = {}
+            for game_path, file in sorted_files:
                 if file.import_to_vfs:
                     sys_path = normalize_system_path(base_path, file.path)
-                    if os.path.exists(sys_path):
-                        try:
-                            md5 = FileEntry.calculate_md5(sys_path)
-                            if md5:
-                                file_elem.set("md5", md5)
-                        except Exception as e:
-                            logger.warning(f"Error calculating MD5 for {sys_path}: {e}")
-                    else:
+                    try:
+                        st = os.stat(sys_path)
+                    except FileNotFoundError:
                         logger.warning(f"File not found: {sys_path} (game path: {file.path})")
-                
+                        continue
+                    except OSError as e:
+                        logger.warning(f"Could not read {sys_path} (game path: {file.path}): {e}")
+                        continue
+                    entry = md5_cache.get(game_path)
+                    if entry and entry[:2] == [st.st_size, st.st_mtime_ns]:
+                        md5s[game_path] = entry[2]
+                    else:
+                        stale[game_path] = (sys_path, st)
+
+            if stale:
+                # Hash each underlying file once, even when several game paths
+                # reach it through links or differently cased names
+                def file_id(sys_path, st):
+                    return (st.st_dev, st.st_ino) if st.st_ino else sys_path
+
+                first_paths = {}
+                for sys_path, st in stale.values():
+                    first_paths.setdefault(file_id(sys_path, st), sys_path)
+                hashed = self._hash_files(first_paths.values())
+                for game_path, (sys_path, st) in stale.items():
+                    md5 = hashed[first_paths[file_id(sys_path, st)]]
+                    md5s[game_path] = md5
+                    if md5:
+                        md5_cache[game_path] = [st.st_size, st.st_mtime_ns, md5]
+
+            sub_element = ET.SubElement
+            for game_path, file in sorted_files:
+                file_elem = sub_element(files, "File")
+                md5 = md5s.get(game_path) if file.import_to_vfs else None
+                if md5:
+                    file_elem.set("md5", md5)
                 file_elem.set("import", "1" if file.import_to_vfs else "0")
-                file_elem.text = normalize_game_path(file.path)
+                file_elem.text = game_path
 
         # Actions
         if self.actions:
@@ -221,31 +473,30 @@ class ModProject:
             "xmlns": ns
         })
 
-        # Basic Properties
-        props = ET.SubElement(root, "PropertyGroup")
-        ET.SubElement(props, "Configuration").text = "Default"
-        ET.SubElement(props, "ProjectGuid").text = self.project_guid
-        ET.SubElement(props, "Name").text = self.name
-        ET.SubElement(props, "Guid").text = self.mod_guid
-        ET.SubElement(props, "ModVersion").text = self.version
-        ET.SubElement(props, "Stability").text = self.stability
-        ET.SubElement(props, "Teaser").text = self.teaser
-        ET.SubElement(props, "Description").text = self.description
-        ET.SubElement(props, "Authors").text = self.authors
-        ET.SubElement(props, "SpecialThanks").text = self.special_thanks
-        ET.SubElement(props, "Homepage").text = self.homepage
-
-        # Support Flags
-        ET.SubElement(props, "AffectsSavedGames").text = str(self.affects_saves).lower()
-        ET.SubElement(props, "MinCompatibleSaveVersion").text = self.min_compatible_save_version
-        ET.SubElement(props, "SupportsSinglePlayer").text = str(self.supports_singleplayer).lower()
-        ET.SubElement(props, "SupportsMultiplayer").text = str(self.supports_multiplayer).lower()
-        ET.SubElement(props, "SupportsHotSeat").text = str(self.supports_hotseat).lower()
-        ET.SubElement(props, "SupportsMac").text = str(self.supports_mac).lower()
-        ET.SubElement(props, "HideSetupGame").text = str(self.hide_setup_game).lower()
-        ET.SubElement(props, "ReloadUnitSystem").text = str(self.reload_unit).lower()
-        ET.SubElement(props, "ReloadLandmarkSystem").text = str(self.reload_landmark).lower()
-        ET.SubElement(props, "ReloadStrategicViewSystem").text = str(self.reload_strategic_view).lower()
+        # Basic properties and support flags have a fixed layout, so parse
+        # them from a template in one go rather than element by element
+        root.append(ET.fromstring(_CIV5PROJ_PROPERTIES_TEMPLATE.format(
+            project_guid=escape(self.project_guid or ""),
+            name=escape(self.name or ""),
+            mod_guid=escape(self.mod_guid or ""),
+            version=escape(self.version or ""),
+            stability=escape(self.stability or ""),
+            teaser=escape(self.teaser or ""),
+            description=escape(self.description or ""),
+            authors=escape(self.authors or ""),
+            special_thanks=escape(self.special_thanks or ""),
+            homepage=escape(self.homepage or ""),
+            affects_saves=_BOOL_LOWER[self.affects_saves],
+            min_save_version=escape(self.min_compatible_save_version or ""),
+            supports_singleplayer=_BOOL_LOWER[self.supports_singleplayer],
+            supports_multiplayer=_BOOL_LOWER[self.supports_multiplayer],
+            supports_hotseat=_BOOL_LOWER[self.supports_hotseat],
+            supports_mac=_BOOL_LOWER[self.supports_mac],
+            hide_setup_game=_BOOL_LOWER[self.hide_setup_game],
+            reload_unit=_BOOL_LOWER[self.reload_unit],
+            reload_landmark=_BOOL_LOWER[self.reload_landmark],
+            reload_strategic_view=_BOOL_LOWER[self.reload_strategic_view],
+        )))
 
         # Dependencies
         if self.dependencies:
@@ -281,11 +532,12 @@ class ModProject:
         # Content Files
         if self.files:
             files = ET.SubElement(root, "ItemGroup")
-            for file in sorted(self.files, key=lambda x: normalize_game_path(x.path)):
-                content = ET.SubElement(files, "Content", {"Include": normalize_game_path(file.path)})
+            sub_element = ET.SubElement
+            for game_path, file in self._sorted_files():
+                content = sub_element(files, "Content", {"Include": game_path})
                 if file.type:
-                    ET.SubElement(content, "SubType").text = file.type
-                ET.SubElement(content, "ImportIntoVFS").text = str(file.import_to_vfs).lower()
+                    sub_element(content, "SubType").text = file.type
+                sub_element(content, "ImportIntoVFS").text = _BOOL_LOWER[file.import_to_vfs]
 
         # Entry Points
         if self.entry_points:
@@ -303,131 +555,198 @@ class ModProject:
 
     @classmethod
     def from_modinfo(cls, modinfo_path: Path) -> 'ModProject':
-        """Create ModProject from a .modinfo file."""
-        tree = ET.parse(str(modinfo_path))
-        root = tree.getroot()
-        
+        """Create ModProject from a .modinfo file (a path or binary file object)."""
+        # Stream the file in one pass, reading each top-level section as soon
+        # as it is complete and then clearing it, so the full tree is never built
+        root = None
+        props = None
+        dependencies, blockers, files, actions, entry_points = [], [], [], [], []
+        depth = 0
+        for event, elem in _iterparse_xml(modinfo_path, ("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            if depth != 1:
+                continue
+            tag = elem.tag
+
+            if tag == "Properties":
+                # Indexed once instead of scanned per lookup
+                if props is None:
+                    props = _children_by_tag(elem)
+            elif tag == "Dependencies":
+                game = elem.find("Game")
+                if game is not None:
+                    dependencies.append(Association(
+                        type="Game",
+                        id=None,  # Game dependency doesn't have an ID
+                        min_version=game.get("minversion", "0"),
+                        max_version=game.get("maxversion", "999")
+                    ))
+                for dlc in elem.findall("Dlc"):
+                    dependencies.append(Association(
+                        type="Dlc",
+                        id=dlc.get("id"),
+                        min_version=dlc.get("minversion", "0"),
+                        max_version=dlc.get("maxversion", "999")
+                    ))
+            elif tag == "Blocks":
+                for mod in elem.findall("Mod"):
+                    blockers.append(Association(
+                        type="Mod",
+                        name=mod.get("title"),
+                        id=mod.get("id"),
+                        min_version=mod.get("minversion", "0"),
+                        max_version=mod.get("maxversion", "999")
+                    ))
+            elif tag == "Files":
+                for file in elem.findall("File"):
+                    files.append(FileEntry(
+                        path=file.text,
+                        import_to_vfs=file.get("import") == "1",
+                        md5=file.get("md5")
+                    ))
+            elif tag == "Actions":
+                for action_set in _child_elements(elem):
+                    set_name = _intern(action_set.tag)
+                    for action in _child_elements(action_set):
+                        actions.append(Action(
+                            action_set=set_name,
+                            action_type=_intern(action.tag),
+                            filename=normalize_game_path(action.text)
+                        ))
+            elif tag == "EntryPoints":
+                for ep in elem.findall("EntryPoint"):
+                    name = ep.find("Name")
+                    desc = ep.find("Description")
+                    entry_points.append(EntryPoint(
+                        type=_intern(ep.get("type")),
+                        file=normalize_game_path(ep.get("file")),
+                        name=name.text if name is not None else "",
+                        description=desc.text if desc is not None else ""
+                    ))
+            elem.clear()
+
+        if props is None:
+            raise ValueError("Properties section missing from mod file")
+
         # Extract basic properties
-        props = root.find("Properties")
         project = cls(
-            name=props.find("Name").text,
+            name=props["Name"].text,
             mod_guid=root.get("id"),
             version=root.get("version"),
-            teaser=props.find("Teaser").text,
-            description=props.find("Description").text,
-            authors=props.find("Authors").text,
-            homepage=props.find("Homepage").text if props.find("Homepage") is not None else "",
+            teaser=props["Teaser"].text,
+            description=props["Description"].text,
+            authors=props["Authors"].text,
+            homepage=props["Homepage"].text if "Homepage" in props else "",
+            dependencies=dependencies,
+            blockers=blockers,
+            files=files,
+            actions=actions,
+            entry_points=entry_points,
         )
 
         # Support flags
-        project.supports_singleplayer = props.find("SupportsSinglePlayer").text == "1"
-        project.supports_multiplayer = props.find("SupportsMultiplayer").text == "1"
-        project.supports_hotseat = props.find("SupportsHotSeat").text == "1"
-        project.supports_mac = props.find("SupportsMac").text == "1"
+        project.supports_singleplayer = props["SupportsSinglePlayer"].text == "1"
+        project.supports_multiplayer = props["SupportsMultiplayer"].text == "1"
+        project.supports_hotseat = props["SupportsHotSeat"].text == "1"
+        project.supports_mac = props["SupportsMac"].text == "1"
         
         # System properties
-        project.affects_saves = props.find("AffectsSavedGames").text == "1"
-        project.min_save_version = props.find("MinCompatibleSaveVersion").text
-        project.hide_setup_game = props.find("HideSetupGame").text == "1" if props.find("HideSetupGame") is not None else False
-        project.reload_audio = props.find("ReloadAudioSystem").text == "1"
-        project.reload_landmark = props.find("ReloadLandmarkSystem").text == "1"
-        project.reload_strategic_view = props.find("ReloadStrategicViewSystem").text == "1"
-        project.reload_unit = props.find("ReloadUnitSystem").text == "1"
-
-        # Dependencies
-        deps = root.find("Dependencies")
-        if deps is not None:
-            game = deps.find("Game")
-            if game is not None:
-                project.dependencies.append(Association(
-                    type="Game",
-                    id=None,  # Game dependency doesn't have an ID
-                    min_version=game.get("minversion", "0"),
-                    max_version=game.get("maxversion", "999")
-                ))
-            for dlc in deps.findall("Dlc"):
-                project.dependencies.append(Association(
-                    type="Dlc",
-                    id=dlc.get("id"),
-                    min_version=dlc.get("minversion", "0"),
-                    max_version=dlc.get("maxversion", "999")
-                ))
-
-        # Blockers
-        blocks = root.find("Blocks")
-        if blocks is not None:
-            for mod in blocks.findall("Mod"):
-                project.blockers.append(Association(
-                    type="Mod",
-                    name=mod.get("title"),
-                    id=mod.get("id"),
-                    min_version=mod.get("minversion", "0"),
-                    max_version=mod.get("maxversion", "999")
-                ))
-
-        # Files
-        files = root.find("Files")
-        if files is not None:
-            for file in files.findall("File"):
-                project.files.append(FileEntry(
-                    path=normalize_game_path(file.text),
-                    import_to_vfs=file.get("import") == "1",
-                    md5=file.get("md5")
-                ))
-
-        # Actions
-        actions = root.find("Actions")
-        if actions is not None:
-            for action_set in actions:
-                set_name = action_set.tag
-                for action in action_set:
-                    action_type = action.tag
-                    project.actions.append(Action(
-                        action_set=set_name,
-                        action_type=action_type,
-                        filename=normalize_game_path(action.text)
-                    ))
-
-        # Entry Points
-        entry_points = root.find("EntryPoints")
-        if entry_points is not None:
-            for ep in entry_points.findall("EntryPoint"):
-                name = ep.find("Name")
-                desc = ep.find("Description")
-                project.entry_points.append(EntryPoint(
-                    type=ep.get("type"),
-                    file=normalize_game_path(ep.get("file")),
-                    name=name.text if name is not None else "",
-                    description=desc.text if desc is not None else ""
-                ))
+        project.affects_saves = props["AffectsSavedGames"].text == "1"
+        project.min_save_version = props["MinCompatibleSaveVersion"].text
+        project.hide_setup_game = props["HideSetupGame"].text == "1" if "HideSetupGame" in props else False
+        project.reload_audio = props["ReloadAudioSystem"].text == "1"
+        project.reload_landmark = props["ReloadLandmarkSystem"].text == "1"
+        project.reload_strategic_view = props["ReloadStrategicViewSystem"].text == "1"
+        project.reload_unit = props["ReloadUnitSystem"].text == "1"
 
         return project
 
     @classmethod
     def from_civ5proj(cls, civ5proj_path: Path) -> 'ModProject':
-        """Create ModProject from a .civ5proj file."""
-        tree = ET.parse(str(civ5proj_path))
-        root = tree.getroot()
-        ns = {'ms': 'http://schemas.microsoft.com/developer/msbuild/2003'}
+        """Create ModProject from a .civ5proj file (a path or binary file object)."""
+        # Helpers take elements indexed by _children_by_tag, so each element's
+        # children are scanned once rather than once per field
+        def get_text(fields, tag, default=""):
+            node = fields.get(tag)
+            return node.text if node is not None else default
+
+        def get_bool(fields, tag, default=True):
+            node = fields.get(tag)
+            return node.text.lower() == "true" if node is not None else default
 
-        # Find PropertyGroup with mod properties
+        def read_associations(container):
+            return [
+                Association(
+                    type=_intern(get_text(fields, "Type")),
+                    name=get_text(fields, "Name"),
+                    id=get_text(fields, "Id"),
+                    min_version=get_text(fields, "MinVersion", "0"),
+                    max_version=get_text(fields, "MaxVersion", "999")
+                )
+                for fields in map(_children_by_tag, _local_children(container, "Association"))
+            ]
+
+        # Stream the file in one pass, reading each section as soon as it is
+        # complete and then clearing it, so the full tree is never built
         props = None
-        for prop_group in root.findall('ms:PropertyGroup', ns):
-            if prop_group.find('ms:Name', ns) is not None:
-                props = prop_group
-                break
+        dependencies, blockers, actions, files, entry_points = [], [], [], [], []
+        depth = 0
+        for event, elem in _iterparse_xml(civ5proj_path, ("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            tag = elem.tag.rpartition('}')[2]
+
+            if tag == "PropertyGroup":
+                # The mod properties are the first top-level group with a Name
+                if props is None and depth == 1:
+                    fields = _children_by_tag(elem)
+                    if "Name" in fields:
+                        props = fields
+            elif tag == "ModDependencies":
+                dependencies += read_associations(elem)
+            elif tag == "ModBlockers":
+                blockers += read_associations(elem)
+            elif tag == "ModActions":
+                for action in _local_children(elem, "Action"):
+                    fields = _children_by_tag(action)
+                    actions.append(Action(
+                        action_set=_intern(get_text(fields, "Set")),
+                        action_type=_intern(get_text(fields, "Type")),
+                        filename=normalize_game_path(get_text(fields, "FileName"))
+                    ))
+            elif tag == "ItemGroup":
+                for content in _local_children(elem, "Content"):
+                    file_path = content.get('Include')
+                    if file_path:
+                        fields = _children_by_tag(content)
+                        files.append(FileEntry(
+                            path=file_path,
+                            import_to_vfs=get_bool(fields, "ImportIntoVFS", False),
+                            type=_intern(get_text(fields, "SubType"))
+                        ))
+            elif tag == "ModContent":
+                for content in _local_children(elem, "Content"):
+                    fields = _children_by_tag(content)
+                    entry_points.append(EntryPoint(
+                        type=_intern(get_text(fields, "Type")),
+                        file=normalize_game_path(get_text(fields, "FileName")),
+                        name=get_text(fields, "Name"),
+                        description=get_text(fields, "Description")
+                    ))
+            else:
+                continue
+            elem.clear()
 
         if props is None:
             raise ValueError("PropertyGroup section missing from project file")
 
-        def get_text(elem, tag, default=""):
-            node = elem.find(f'ms:{tag}', ns)
-            return node.text if node is not None else default
-
-        def get_bool(elem, tag, default=True):
-            node = elem.find(f'ms:{tag}', ns)
-            return node.text.lower() == "true" if node is not None else default
-
         # Create project instance
         project = cls(
             name=get_text(props, "Name"),
@@ -440,6 +759,11 @@ class ModProject:
             authors=get_text(props, "Authors"),
             special_thanks=get_text(props, "SpecialThanks"),
             homepage=get_text(props, "Homepage"),
+            dependencies=dependencies,
+            blockers=blockers,
+            files=files,
+            actions=actions,
+            entry_points=entry_points,
         )
 
         # Support flags
@@ -454,73 +778,53 @@ class ModProject:
         project.reload_landmark = get_bool(props, "ReloadLandmarkSystem")
         project.reload_strategic_view = get_bool(props, "ReloadStrategicViewSystem")
 
-        # Dependencies
-        for assoc in root.findall('.//ms:ModDependencies/ms:Association', ns):
-            project.dependencies.append(Association(
-                type=get_text(assoc, "Type"),
-                name=get_text(assoc, "Name"),
-                id=get_text(assoc, "Id"),
-                min_version=get_text(assoc, "MinVersion", "0"),
-                max_version=get_text(assoc, "MaxVersion", "999")
-            ))
-
-        # Blockers
-        for assoc in root.findall('.//ms:ModBlockers/ms:Association', ns):
-            project.blockers.append(Association(
-                type=get_text(assoc, "Type"),
-                name=get_text(assoc, "Name"),
-                id=get_text(assoc, "Id"),
-                min_version=get_text(assoc, "MinVersion", "0"),
-                max_version=get_text(assoc, "MaxVersion", "999")
-            ))
-
-        # Actions
-        for action in root.findall('.//ms:ModActions/ms:Action', ns):
-            project.actions.append(Action(
-                action_set=get_text(action, "Set"),
-                action_type=get_text(action, "Type"),
-                filename=normalize_game_path(get_text(action, "FileName"))
-            ))
-
-        # Files
-        for content in root.findall('.//ms:ItemGroup/ms:Content', ns):
-            file_path = content.get('Include')
-            if file_path:
-                project.files.append(FileEntry(
-                    path=normalize_game_path(file_path),
-                    import_to_vfs=get_bool(content, "ImportIntoVFS", False),
-                    type=get_text(content, "SubType")
-                ))
-
-        # Entry Points
-        for content in root.findall('.//ms:ModContent/ms:Content', ns):
-            project.entry_points.append(EntryPoint(
-                type=get_text(content, "Type"),
-                file=normalize_game_path(get_text(content, "FileName")),
-                name=get_text(content, "Name"),
-                description=get_text(content, "Description")
-            ))
-
         return project
 
-    def write_modinfo(self, output_path: Path, base_path: Optional[Path] = None):
-        """Write the project to a .modinfo file."""
+    @classmethod
+    def loads_modinfo(cls, data) -> 'ModProject':
+        """Create ModProject from .modinfo contents (str or bytes)."""
+        return cls.from_modinfo(_xml_source(data))
+
+    @classmethod
+    def loads_civ5proj(cls, data) -> 'ModProject':
+        """Create ModProject from .civ5proj contents (str or bytes)."""
+        return cls.from_civ5proj(_xml_source(data))
+
+    def dumps_modinfo(self, base_path: Path, md5_cache: Optional[dict] = None) -> str:
+        """Get the project's .modinfo contents, hashing files under base_path."""
+        return _xml_text(self.to_modinfo(base_path, md5_cache))
+
+    def dumps_civ5proj(self) -> str:
+        """Get the project's .civ5proj contents."""
+        return _xml_text(self.to_civ5proj())
+
+    def write_modinfo(self, output_path: Path, base_path: Optional[Path] = None,
+                      rehash: bool = False):
+        """
+        Write the project to a .modinfo file.
+
+        Hashes are cached in a sidecar file under base_path and reused for
+        files whose size and mtime are unchanged; rehash ignores the cached
+        hashes and replaces them.
+        """
         if base_path is None:
             base_path = output_path.parent
-        
-        tree = ET.ElementTree(self.to_modinfo(base_path))
-        
-        # Use minidom for pretty printing
-        from xml.dom import minidom
-        rough_string = ET.tostring(tree.getroot(), 'utf-8')
-        reparsed = minidom.parseString(rough_string)
-        
-        with open(output_path, "w", encoding='utf-8') as f:
-            f.write(reparsed.toprettyxml(indent="  "))
+
+        cache_path = self._md5_cache_path(base_path)
+        loaded = {} if rehash else self._load_md5_cache(cache_path)
+        cache = dict(loaded)
+        _write_text(self.dumps_modinfo(base_path, cache), output_path)
+
+        # Keep only the project's current VFS files, so that entries for
+        # removed files don't accumulate
+        vfs_paths = {normalize_game_path(f.path) for f in self.files if f.import_to_vfs}
+        cache = {path: entry for path, entry in cache.items() if path in vfs_paths}
+        if rehash or cache != loaded:
+            self._save_md5_cache(cache_path, cache)
 
     def write_civ5proj(self, output_path: Path, create_solution: bool = True):
         """Write the project to a .civ5proj file."""
-        tree = ET.ElementTree(self.to_civ5proj())
+        text = self.dumps_civ5proj()
         
         # Use base name (without version or prefix) for project files
         output_dir = output_path.parent
@@ -528,18 +832,10 @@ class ModProject:
         if base_name.startswith("(1) "):  # Remove prefix if present
             base_name = base_name[4:]  # Remove "(1) " prefix
         output_path = output_dir / f"{base_name}.civ5proj"
-        
-        # Use minidom for pretty printing
-        from xml.dom import minidom
-        rough_string = ET.tostring(tree.getroot(), 'utf-8')
-        reparsed = minidom.parseString(rough_string)
-        
-        with open(output_path, "w", encoding='utf-8') as f:
-            f.write(reparsed.toprettyxml(indent="  "))
+        _write_text(text, output_path)
 
         # Create or update solution file if requested
         if create_solution:
-            from .solution import ModSolution
             sln_path = output_dir / f"{base_name}.civ5sln"
             
             # Try to load existing solution or create new one
@@ -549,7 +845,6 @@ class ModProject:
                 # Check if project is already in solution
                 proj_paths = [p.path for p in solution.projects]
                 if output_path.name not in proj_paths:
-                    from .solution import ProjectReference
                     solution.projects.append(ProjectReference(
                         path=output_path.name,
                         name=self.name
@@ -1,17 +1,33 @@
 """Path handling utilities for Civilization V mod files."""
+import functools
 import os
-import re
 from pathlib import Path
 
+@functools.lru_cache(maxsize=4096)
 def normalize_game_path(path: str) -> str:
     """
     Convert any path to Windows-style for game files.
     All paths in .modinfo and .civ5proj should use Windows-style backslashes.
     """
-    # First normalize according to system conventions
-    normalized = os.path.normpath(str(path))
-    # Then convert to Windows style
-    return normalized.replace('/', '\\')
+    path = str(path)
+    # First normalize according to system conventions, unless there is
+    # nothing that normpath would change
+    if _needs_normpath(path):
+        path = os.path.normpath(path)
+    # Then convert to Windows style (str.replace beats str.translate by an
+    # order of magnitude for single-character substitutions)
+    return path.replace('/', '\\')
+
+def _needs_normpath(path: str) -> bool:
+    """Check if a path may contain dot components or redundant separators."""
+    return (
+        not path
+        or path.startswith('.')
+        or path.endswith(('/', '\\'))
+        or '/.' in path or '\\.' in path
+        or '//' in path or '\\\\' in path
+        or '/\\' in path or '\\/' in path
+    )
 
 def normalize_system_path(base_path: str, game_path: str) -> str:
     """
@@ -28,62 +44,102 @@ def normalize_system_path(base_path: str, game_path: str) -> str:
     # Join with base path and normalize
     return os.path.normpath(os.path.join(str(base_path), sys_path))
 
+def _path_key(p: str) -> tuple[tuple[str, ...], bool]:
+    """
+    Split a forward-slash path into lowercased, resolved components in a single pass.
+
+    Returns the component tuple and whether the path had any parent
+    directory references.
+    """
+    parts = []
+    had_parent = False
+    for part in p.lower().split('/'):
+        if part == '.' or not part:
+            continue
+        elif part == '..':
+            had_parent = True
+            if parts:
+                parts.pop()
+        else:
+            parts.append(part)
+    return tuple(parts), had_parent
+
+def _is_plain_path(p: str) -> bool:
+    """Check if a forward-slash path has no components that need resolving."""
+    return not (p.startswith(('.', '/')) or p.endswith('/') or '/.' in p or '//' in p)
+
 def paths_equal(path1: str, path2: str) -> bool:
     """
     Compare paths ignoring separator style and normalization.
     Both forward slashes and backslashes are treated as equivalent.
     Handles ./ and ../ normalization.
     """
-    def normalize(p: str) -> tuple[str, ...]:
-        # Convert to forward slashes and normalize
-        p = p.replace('\\', '/')
-        # Split into components
-        parts = []
-        for part in p.split('/'):
-            if part == '.' or not part:
-                continue
-            elif part == '..':
-                if parts:
-                    parts.pop()
-            else:
-                parts.append(part.lower())  # Case-insensitive comparison
-        # Return as tuple for immutable comparison
-        return tuple(parts)
+    if path1 == path2:
+        return True
 
-    def has_parent_refs(p: str) -> bool:
-        """Check if path contains parent directory references."""
-        return '..' in p.replace('\\', '/').split('/')
+    # Fast path: without dot components or redundant separators the
+    # comparison is a plain case-insensitive string compare
+    a = path1.replace('\\', '/')
+    b = path2.replace('\\', '/')
+    if _is_plain_path(a) and _is_plain_path(b):
+        # Lowercasing ASCII keeps the length, so a length mismatch decides it
+        if len(a) != len(b) and a.isascii() and b.isascii():
+            return False
+        return a.lower() == b.lower()
 
-    # Get normalized path components
-    parts1 = normalize(path1)
-    parts2 = normalize(path2)
+    parts1, had_parent1 = _path_key(a)
+    parts2, had_parent2 = _path_key(b)
 
     # If paths are equal after normalization but one has parent refs and the other doesn't,
     # consider them different (e.g., "a/b/../c" vs "a/c")
-    if parts1 == parts2 and has_parent_refs(path1) != has_parent_refs(path2):
-        return False
+    return parts1 == parts2 and had_parent1 == had_parent2
 
-    # Otherwise compare normalized paths
-    return parts1 == parts2
-
-def list_mod_files(directory: Path, relative_to: Path = None) -> list[str]:
+def list_mod_files(directory: Path, relative_to: Path = None,
+                   extensions=None) -> list[str]:
     """
     List all files in a mod directory, returning Windows-style relative paths.
     
     Args:
         directory: Directory to scan for files
         relative_to: Base directory for relative paths (defaults to directory)
+        extensions: Only list files with these extensions, e.g. {"xml", "sql"}
+            (case-insensitive, leading dot optional; defaults to all files)
     Returns:
         List of Windows-style paths relative to relative_to
     """
     if relative_to is None:
         relative_to = directory
 
+    # Relative prefix of the scanned directory, computed once
+    rel_dir = normalize_game_path(str(Path(directory).relative_to(relative_to)))
+    prefix = '' if rel_dir == '.' else rel_dir + '\\'
+
+    if extensions is not None:
+        extensions = frozenset(ext.lower().lstrip('.') for ext in extensions)
+
     files = []
-    for root, _, filenames in os.walk(directory):
-        for filename in filenames:
-            abs_path = Path(root) / filename
-            rel_path = abs_path.relative_to(relative_to)
-            files.append(normalize_game_path(str(rel_path)))
-    
-    return sorted(files)
\ No newline at end of file
+    _scan_mod_dir(str(directory), prefix, files, extensions)
+    files.sort()
+    return files
+
+def _scan_mod_dir(directory: str, prefix: str, out: list[str],
+                  extensions: frozenset = None) -> None:
+    """Recursively append Windows-style paths of files under directory to out."""
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        # Like os.walk, skip directories that can't be listed
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir():
+                # Like os.walk, don't descend into symlinked directories
+                if not entry.is_symlink():
+                    _scan_mod_dir(entry.path, prefix + entry.name + '\\', out, extensions)
+            else:
+                # Filter on the bare name before building the path
+                if extensions is not None:
+                    _, dot, ext = entry.name.rpartition('.')
+                    if not dot or ext.lower() not in extensions:
+                        continue
+                out.append(prefix + entry.name)
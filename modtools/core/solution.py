@@ -1,21 +1,69 @@
 """Solution file handling for Civilization V mods."""
-import re
 from dataclasses import dataclass, field
 from pathlib import Path
 import uuid
-import logging
 from typing import List, Optional
-
-logger = logging.getLogger(__name__)
-
-@dataclass
+from .paths import normalize_game_path
+
+# ModBuddy project type GUID
+_MODBUDDY_TYPE_GUID = "{F5FC21B5-7CC2-458A-ABBA-992F515BBA20}"
+
+# Fixed solution boilerplate, joined with the per-project blocks by newlines
+_SLN_HEADER = (
+    "\n"  # Solution files start with a blank line after the BOM
+    "Microsoft Visual Studio Solution File, Format Version 11.00\n"
+    "# ModBuddy Solution File, Format Version 11.00"
+)
+_SLN_CONFIG_BLOCK = (
+    "Global\n"
+    "\tGlobalSection(SolutionConfigurationPlatforms) = preSolution\n"
+    "\t\tDefault|x86 = Default|x86\n"
+    "\t\tDeploy Only|x86 = Deploy Only|x86\n"
+    "\t\tPackage Only|x86 = Package Only|x86\n"
+    "\tEndGlobalSection\n"
+    "\tGlobalSection(ProjectConfigurationPlatforms) = postSolution"
+)
+_SLN_TAIL = (
+    "\tEndGlobalSection\n"
+    "\tGlobalSection(SolutionProperties) = preSolution\n"
+    "\t\tHideSolutionNode = FALSE\n"
+    "\tEndGlobalSection\n"
+    "EndGlobal"
+)
+
+# Per-project solution blocks, formatted once per project
+_PROJ_DECL_TEMPLATE = (
+    'Project("{type_guid}") = "{name}", "{path}", "{guid}"\n'
+    'EndProject'
+)
+_PROJ_CFG_TEMPLATE = (
+    "\t\t{{{guid}}}.Default|x86.ActiveCfg = Default|x86\n"
+    "\t\t{{{guid}}}.Default|x86.Build.0 = Default|x86\n"
+    "\t\t{{{guid}}}.Deploy Only|x86.ActiveCfg = Deploy Only|x86\n"
+    "\t\t{{{guid}}}.Deploy Only|x86.Build.0 = Deploy Only|x86\n"
+    "\t\t{{{guid}}}.Package Only|x86.ActiveCfg = Package Only|x86\n"
+    "\t\t{{{guid}}}.Package Only|x86.Build.0 = Package Only|x86"
+)
+
+@dataclass(slots=True)
 class ProjectReference:
     """Represents a project reference in a solution."""
     path: str
     name: str
     guid: str = ""
+    # VS uses uppercase GUIDs without braces in configuration section;
+    # derived from guid whenever it is assigned
+    config_guid: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.path = normalize_game_path(self.path)
 
-@dataclass
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name == "guid":
+            object.__setattr__(self, "config_guid", value.strip('{}').upper())
+
+@dataclass(slots=True)
 class ModSolution:
     """Represents a Civilization V solution (.civ5sln)."""
     name: str
@@ -26,92 +74,72 @@ class ModSolution:
     @staticmethod
     def normalize_path(path: str) -> str:
         """Normalize path to Windows style."""
-        return str(Path(path)).replace('/', '\\')
+        return normalize_game_path(path)
 
     def to_sln(self) -> str:
         """Convert to Visual Studio solution format."""
-        lines = [
-            "",  # BOM will be added when writing
-            "Microsoft Visual Studio Solution File, Format Version 11.00",
-            "# ModBuddy Solution File, Format Version 11.00"
-        ]
+        lines = [_SLN_HEADER]
 
         # Add project declarations
         for proj in self.projects:
-            proj_path = self.normalize_path(proj.path)
-            # ModBuddy project type GUID
-            lines.append(f'Project("{{F5FC21B5-7CC2-458A-ABBA-992F515BBA20}}") = "{proj.name}", "{proj_path}", "{proj.guid}"')
-            lines.append("EndProject")
-
-        # Add solution configurations
-        lines.extend([
-            "Global",
-            "\tGlobalSection(SolutionConfigurationPlatforms) = preSolution",
-            "\t\tDefault|x86 = Default|x86",
-            "\t\tDeploy Only|x86 = Deploy Only|x86",
-            "\t\tPackage Only|x86 = Package Only|x86",
-            "\tEndGlobalSection"
-        ])
-
-        # Add project configurations
-        lines.append("\tGlobalSection(ProjectConfigurationPlatforms) = postSolution")
+            lines.append(_PROJ_DECL_TEMPLATE.format(
+                type_guid=_MODBUDDY_TYPE_GUID,
+                name=proj.name,
+                path=self.normalize_path(proj.path),
+                guid=proj.guid
+            ))
+
+        # Add solution and project configurations
+        lines.append(_SLN_CONFIG_BLOCK)
         for proj in self.projects:
-            # VS uses uppercase GUIDs in configuration section
-            guid = proj.guid.strip('{}').upper()
-            lines.extend([
-                f"\t\t{{{guid}}}.Default|x86.ActiveCfg = Default|x86",
-                f"\t\t{{{guid}}}.Default|x86.Build.0 = Default|x86",
-                f"\t\t{{{guid}}}.Deploy Only|x86.ActiveCfg = Deploy Only|x86",
-                f"\t\t{{{guid}}}.Deploy Only|x86.Build.0 = Deploy Only|x86",
-                f"\t\t{{{guid}}}.Package Only|x86.ActiveCfg = Package Only|x86",
-                f"\t\t{{{guid}}}.Package Only|x86.Build.0 = Package Only|x86"
-            ])
-        lines.append("\tEndGlobalSection")
+            lines.append(_PROJ_CFG_TEMPLATE.format(guid=proj.config_guid))
 
         # Add solution properties
-        lines.extend([
-            "\tGlobalSection(SolutionProperties) = preSolution",
-            "\t\tHideSolutionNode = FALSE",
-            "\tEndGlobalSection",
-            "EndGlobal"
-        ])
+        lines.append(_SLN_TAIL)
 
         return "\n".join(lines)
 
     def write(self, path: Path):
         """Write the solution to a .civ5sln file."""
-        content = self.to_sln()
-        # Write with BOM for Visual Studio compatibility
+        # Write with BOM for Visual Studio compatibility, in text mode so
+        # lines end in CRLF on Windows as Visual Studio expects
         with open(path, "w", encoding='utf-8-sig') as f:
-            f.write(content)
+            f.write(self.to_sln())
 
     @classmethod
     def from_sln(cls, path: Path) -> 'ModSolution':
         """Create ModSolution from a .civ5sln file."""
-        with open(path, 'r', encoding='utf-8-sig') as f:
-            content = f.read()
-
-        # Extract solution name from first project name
-        proj_match = re.search(r'Project.*?\s*=\s*"([^"]+)"', content)
-        if not proj_match:
+        name = None
+        projects = []
+        with open(path, 'r', encoding='utf-8-sig', buffering=65536) as f:
+            for line in f:
+                line = line.lstrip()
+                if not line.startswith('Project('):
+                    # Project declarations all precede the Global section
+                    if line.startswith('Global'):
+                        break
+                    continue
+
+                # Project("{type}") = "name", "path", "{guid}"
+                tokens = line.split('"')
+                if len(tokens) < 8:
+                    continue
+                type_guid, proj_name, proj_path, proj_guid = tokens[1:8:2]
+
+                # Solution name comes from the first project declared
+                if name is None:
+                    name = proj_name
+                if type_guid.upper() == _MODBUDDY_TYPE_GUID:
+                    projects.append(ProjectReference(
+                        name=proj_name,
+                        path=proj_path,
+                        guid=proj_guid
+                    ))
+
+        if name is None:
             raise ValueError("No project found in solution file")
-        name = proj_match.group(1)
-
-        # Create solution instance
-        solution = cls(name=name)
-
-        # Extract projects
-        proj_pattern = r'Project\("({[^}]+})"\)\s*=\s*"([^"]+)"\s*,\s*"([^"]+)"\s*,\s*"({[^}]+})"'
-        for match in re.finditer(proj_pattern, content, re.MULTILINE):
-            type_guid, proj_name, proj_path, proj_guid = match.groups()
-            if type_guid.lower() == "{f5fc21b5-7cc2-458a-abba-992f515bba20}":  # ModBuddy project type
-                solution.projects.append(ProjectReference(
-                    name=proj_name,
-                    path=proj_path,
-                    guid=proj_guid
-                ))
-
-        return solution
+
+        return cls(name=name, projects=projects)
 
     @classmethod
     def create_for_project(cls, project_path: Path, project_name: Optional[str] = None) -> 'ModSolution':
@@ -1,18 +1,186 @@
 import sys
+import copy
+import functools
+import hashlib
+import os
+import pickle
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QFileDialog, QMessageBox, QTabWidget,
-    QLineEdit, QTextEdit, QCheckBox, QGroupBox, QScrollArea
+    QPushButton, QFileDialog, QMessageBox, QTabWidget,
+    QLineEdit, QTextEdit, QCheckBox, QGroupBox, QScrollArea, QFormLayout,
+    QTableView, QHeaderView, QAbstractItemView, QFileIconProvider,
+    QStyledItemDelegate, QCompleter
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool,
+    QSignalMapper, QStringListModel, pyqtSignal, pyqtSlot
+)
+from .. import __version__
 from ..core.models import ModProject, FileEntry, Association, Action, EntryPoint
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Parsed projects, keyed by source path, mtime and size
+CACHE_DIR = Path.home() / ".cache" / "civ5modtool"
+
+# Bump when parser output or the pickled classes change, so that caches
+# written by older code are not loaded
+CACHE_VERSION = 1
+
+# (header, attribute) columns shown for each project list
+DEPENDENCY_COLUMNS = [("Type", "type"), ("Name", "name"), ("ID", "id"),
+                      ("Min Ver", "min_version"), ("Max Ver", "max_version")]
+BLOCKER_COLUMNS = [("Name", "name"), ("ID", "id"),
+                   ("Min Ver", "min_version"), ("Max Ver", "max_version")]
+FILE_COLUMNS = [("Path", "path"), ("Import to VFS", "import_to_vfs")]
+ACTION_COLUMNS = [("Set", "action_set"), ("Type", "action_type"), ("File", "filename")]
+ENTRY_POINT_COLUMNS = [("Type", "type"), ("File", "file"),
+                       ("Name", "name"), ("Desc", "description")]
+
+# Tabs holding project lists: (title, lists), each list being
+# (name, group title, add button text, add slot, path column)
+LIST_TABS = [
+    ("Dependencies", [
+        ("deps", "Dependencies", "Add Dependency", "add_dependency", None),
+        ("blocks", "Blockers", "Add Blocker", "add_blocker", None),
+    ]),
+    ("Files", [("files", None, "Add File", "add_file", 0)]),
+    ("Actions", [("actions", None, "Add Action", "add_action", 2)]),
+    ("Entry Points", [("entry_points", None, "Add Entry Point", "add_entry_point", 1)]),
+]
+
+class ItemTableModel(QAbstractTableModel):
+    """Table model editing a list of dataclass items in place."""
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self._columns = columns
+        self._items = []
+
+    def set_items(self, items):
+        """Show and edit the given list; the list itself is modified."""
+        self.beginResetModel()
+        self._items = items
+        self.endResetModel()
+
+    def append(self, item):
+        row = len(self._items)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.append(item)
+        self.endInsertRows()
+
+    def remove_rows(self, rows):
+        """Remove rows by index, deleting each contiguous run as one slice."""
+        rows = sorted(rows, reverse=True)
+        i = 0
+        while i < len(rows):
+            last = first = rows[i]
+            i += 1
+            while i < len(rows) and rows[i] == first - 1:
+                first = rows[i]
+                i += 1
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._items[first:last + 1]
+            self.endRemoveRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self._columns[section][0]
+        return None
+
+    def _value(self, index):
+        return getattr(self._items[index.row()], self._columns[index.column()][1])
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if isinstance(self._value(index), bool):
+            return flags | Qt.ItemFlag.ItemIsUserCheckable
+        return flags | Qt.ItemFlag.ItemIsEditable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self._value(index)
+        if isinstance(value, bool):
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if value else Qt.CheckState.Unchecked
+        elif role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return value or ""
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid():
+            return False
+        item = self._items[index.row()]
+        attr = self._columns[index.column()][1]
+        if isinstance(getattr(item, attr), bool):
+            if role != Qt.ItemDataRole.CheckStateRole:
+                return False
+            setattr(item, attr, Qt.CheckState(value) == Qt.CheckState.Checked)
+        elif role == Qt.ItemDataRole.EditRole:
+            setattr(item, attr, value)
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+class _PathDelegate(QStyledItemDelegate):
+    """Edit paths with completion from an in-memory list, never the filesystem."""
+
+    def __init__(self, completions, parent=None):
+        super().__init__(parent)
+        self._completions = completions
+
+    def createEditor(self, parent, option, index):
+        editor = super().createEditor(parent, option, index)
+        if isinstance(editor, QLineEdit):
+            completer = QCompleter(self._completions, editor)
+            completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+            editor.setCompleter(completer)
+        return editor
+
+class _NoIconProvider(QFileIconProvider):
+    """Icon provider that never touches the filesystem."""
+
+    def icon(self, _):
+        return QIcon()
+
+class _Worker(QRunnable):
+    """Run a callable on the thread pool and report its outcome by signal."""
+
+    class Signals(QObject):
+        finished = pyqtSignal(object)
+        failed = pyqtSignal(str)
+
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        self.signals = self.Signals()
+
+    def run(self):
+        try:
+            result = self.fn()
+        except Exception as e:
+            logger.exception("Background job failed")
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
 class ModToolsWindow(QMainWindow):
+    MODINFO_FILTER = "ModInfo Files (*.modinfo)"
+    CIV5PROJ_FILTER = "Civ5Proj Files (*.civ5proj)"
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Civilization V Mod Tools")
@@ -50,438 +218,368 @@ class ModToolsWindow(QMainWindow):
 
         toolbar.addStretch()
 
+        # List models exist up front; their views are built with their tabs
+        self.deps_model = ItemTableModel(DEPENDENCY_COLUMNS, self)
+        self.blocks_model = ItemTableModel(BLOCKER_COLUMNS, self)
+        self.files_model = ItemTableModel(FILE_COLUMNS, self)
+        self.actions_model = ItemTableModel(ACTION_COLUMNS, self)
+        self.entry_points_model = ItemTableModel(ENTRY_POINT_COLUMNS, self)
+
+        # Path cells complete from the project's files, held in memory
+        self._path_completer_model = QStringListModel(self)
+        self._path_delegate = _PathDelegate(self._path_completer_model, self)
+        for signal in (self.files_model.modelReset, self.files_model.rowsInserted,
+                       self.files_model.rowsRemoved, self.files_model.dataChanged):
+            signal.connect(self._refresh_path_completions)
+
+        # Every Remove button is routed through one mapper to its view
+        self._remove_mapper = QSignalMapper(self)
+        self._remove_mapper.mappedObject.connect(self.remove_selected)
+
         # Create tab widget
         self.tabs = QTabWidget()
         layout.addWidget(self.tabs)
 
-        # Create tabs
-        self.create_basic_info_tab()
-        self.create_dependencies_tab()
-        self.create_files_tab()
-        self.create_actions_tab()
-        self.create_entry_points_tab()
+        # Create tabs, building each one the first time it is shown
+        self._tab_builders = [("Basic Info", self.create_basic_info_tab)]
+        self._tab_builders += [(title, functools.partial(self.create_list_tab, lists))
+                               for title, lists in LIST_TABS]
+        self._built_tabs = set()
+        for title, _ in self._tab_builders:
+            self.tabs.addTab(QWidget(), title)
+        self.tabs.currentChanged.connect(self._ensure_tab_built)
+        self._ensure_tab_built(0)
+
+        # One file dialog for every flow. Native dialogs, custom directory
+        # icons and per-file icon lookups stat every entry and can freeze the
+        # event loop for seconds on some desktops
+        self._file_dlg = QFileDialog(self)
+        self._file_dlg.setOption(QFileDialog.Option.DontUseNativeDialog, True)
+        self._file_dlg.setOption(QFileDialog.Option.DontUseCustomDirectoryIcons, True)
+        # The dialog does not take ownership of its icon provider
+        self._icon_provider = _NoIconProvider()
+        self._file_dlg.setIconProvider(self._icon_provider)
+
+        # Load/save job running on the thread pool, if any
+        self._job = None
 
         # Initialize project
         self.project = ModProject(name="New Mod")
         self.update_ui_from_project()
 
+    def _ensure_tab_built(self, index):
+        if index < 0 or index in self._built_tabs:
+            return
+        self._built_tabs.add(index)
+        title, builder = self._tab_builders[index]
+
+        # Swap the placeholder for the real tab without re-entering this slot
+        placeholder = self.tabs.widget(index)
+        self.tabs.blockSignals(True)
+        try:
+            self.tabs.removeTab(index)
+            self.tabs.insertTab(index, builder(), title)
+            self.tabs.setCurrentIndex(index)
+        finally:
+            self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+
     def create_basic_info_tab(self):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         widget = QWidget()
-        layout = QVBoxLayout(widget)
+        layout = QFormLayout(widget)
         scroll.setWidget(widget)
-        self.tabs.addTab(scroll, "Basic Info")
 
-        # Basic info fields
-        self.name_edit = self.add_field(layout, "Name:")
-        self.mod_guid_edit = self.add_field(layout, "Mod GUID:")
-        self.version_edit = self.add_field(layout, "Version:")
-        self.teaser_edit = self.add_field(layout, "Teaser:")
+        # Basic info fields, each written back to the project as it is edited
+        self.name_edit = self.add_field(layout, "Name:", "name")
+        self.mod_guid_edit = self.add_field(layout, "Mod GUID:", "mod_guid")
+        self.version_edit = self.add_field(layout, "Version:", "version")
+        self.teaser_edit = self.add_field(layout, "Teaser:", "teaser")
         
         self.description_edit = QTextEdit()
-        layout.addWidget(QLabel("Description:"))
-        layout.addWidget(self.description_edit)
+        self.description_edit.textChanged.connect(
+            lambda: setattr(self.project, "description", self.description_edit.toPlainText()))
+        layout.addRow("Description:", self.description_edit)
         
-        self.authors_edit = self.add_field(layout, "Authors:")
-        self.homepage_edit = self.add_field(layout, "Homepage:")
+        self.authors_edit = self.add_field(layout, "Authors:", "authors")
+        self.homepage_edit = self.add_field(layout, "Homepage:", "homepage")
 
         # Support flags
         flags_group = QGroupBox("Support Flags")
         flags_layout = QVBoxLayout()
         flags_group.setLayout(flags_layout)
-        layout.addWidget(flags_group)
-
-        self.affects_saves_cb = QCheckBox("Affects Saved Games")
-        flags_layout.addWidget(self.affects_saves_cb)
-        
-        self.supports_sp_cb = QCheckBox("Supports Single Player")
-        flags_layout.addWidget(self.supports_sp_cb)
-        
-        self.supports_mp_cb = QCheckBox("Supports Multiplayer")
-        flags_layout.addWidget(self.supports_mp_cb)
-        
-        self.supports_hotseat_cb = QCheckBox("Supports Hot Seat")
-        flags_layout.addWidget(self.supports_hotseat_cb)
-        
-        self.supports_mac_cb = QCheckBox("Supports Mac")
-        flags_layout.addWidget(self.supports_mac_cb)
-        
-        self.hide_setup_cb = QCheckBox("Hide in Setup")
-        flags_layout.addWidget(self.hide_setup_cb)
-
-        layout.addStretch()
-
-    def create_dependencies_tab(self):
+        layout.addRow(flags_group)
+
+        self.affects_saves_cb = self.add_flag(flags_layout, "Affects Saved Games", "affects_saves")
+        self.supports_sp_cb = self.add_flag(flags_layout, "Supports Single Player", "supports_singleplayer")
+        self.supports_mp_cb = self.add_flag(flags_layout, "Supports Multiplayer", "supports_multiplayer")
+        self.supports_hotseat_cb = self.add_flag(flags_layout, "Supports Hot Seat", "supports_hotseat")
+        self.supports_mac_cb = self.add_flag(flags_layout, "Supports Mac", "supports_mac")
+        self.hide_setup_cb = self.add_flag(flags_layout, "Hide in Setup", "hide_setup_game")
+        return scroll
+
+    def create_list_tab(self, lists):
+        """Build a tab showing the given LIST_TABS entries one below another."""
         widget = QWidget()
         layout = QVBoxLayout(widget)
-        self.tabs.addTab(widget, "Dependencies")
-
-        # Dependencies list
-        deps_group = QGroupBox("Dependencies")
-        deps_layout = QVBoxLayout()
-        deps_group.setLayout(deps_layout)
-        layout.addWidget(deps_group)
-
-        # Add dependency button
-        add_dep_btn = QPushButton("Add Dependency")
-        add_dep_btn.clicked.connect(self.add_dependency)
-        deps_layout.addWidget(add_dep_btn)
-
-        # Dependencies list widget
-        self.deps_list = QVBoxLayout()
-        deps_layout.addLayout(self.deps_list)
-
-        # Blockers
-        blocks_group = QGroupBox("Blockers")
-        blocks_layout = QVBoxLayout()
-        blocks_group.setLayout(blocks_layout)
-        layout.addWidget(blocks_group)
-
-        # Add blocker button
-        add_block_btn = QPushButton("Add Blocker")
-        add_block_btn.clicked.connect(self.add_blocker)
-        blocks_layout.addWidget(add_block_btn)
-
-        # Blockers list widget
-        self.blocks_list = QVBoxLayout()
-        blocks_layout.addLayout(self.blocks_list)
-
-        layout.addStretch()
-
-    def create_files_tab(self):
-        widget = QWidget()
-        layout = QVBoxLayout(widget)
-        self.tabs.addTab(widget, "Files")
-
-        # Add file button
-        add_file_btn = QPushButton("Add File")
-        add_file_btn.clicked.connect(self.add_file)
-        layout.addWidget(add_file_btn)
-
-        # Files list
-        self.files_list = QVBoxLayout()
-        layout.addLayout(self.files_list)
-        layout.addStretch()
-
-    def create_actions_tab(self):
-        widget = QWidget()
-        layout = QVBoxLayout(widget)
-        self.tabs.addTab(widget, "Actions")
-
-        # Add action button
-        add_action_btn = QPushButton("Add Action")
-        add_action_btn.clicked.connect(self.add_action)
-        layout.addWidget(add_action_btn)
-
-        # Actions list
-        self.actions_list = QVBoxLayout()
-        layout.addLayout(self.actions_list)
-        layout.addStretch()
-
-    def create_entry_points_tab(self):
-        widget = QWidget()
-        layout = QVBoxLayout(widget)
-        self.tabs.addTab(widget, "Entry Points")
-
-        # Add entry point button
-        add_ep_btn = QPushButton("Add Entry Point")
-        add_ep_btn.clicked.connect(self.add_entry_point)
-        layout.addWidget(add_ep_btn)
-
-        # Entry points list
-        self.entry_points_list = QVBoxLayout()
-        layout.addLayout(self.entry_points_list)
-        layout.addStretch()
-
-    def add_field(self, layout, label_text):
-        label = QLabel(label_text)
+        for name, group_title, add_text, add_slot, path_column in lists:
+            view = self.create_table(getattr(self, f"{name}_model"))
+            if path_column is not None:
+                view.setItemDelegateForColumn(path_column, self._path_delegate)
+            setattr(self, f"{name}_view", view)
+
+            target = layout
+            if group_title:
+                group = QGroupBox(group_title)
+                target = QVBoxLayout()
+                group.setLayout(target)
+                layout.addWidget(group)
+            target.addLayout(self.create_list_buttons(
+                add_text, getattr(self, add_slot), view))
+            target.addWidget(view)
+        return widget
+
+    def create_table(self, model):
+        """Create a view for a list model; only visible rows are ever painted."""
+        view = QTableView()
+        view.setModel(model)
+        view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        view.horizontalHeader().setStretchLastSection(True)
+        # Fixed row heights spare the view from measuring every row
+        view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        return view
+
+    def _refresh_path_completions(self):
+        self._path_completer_model.setStringList([f.path for f in self.project.files])
+
+    def create_list_buttons(self, add_text, add_slot, view):
+        buttons = QHBoxLayout()
+        add_btn = QPushButton(add_text)
+        add_btn.clicked.connect(add_slot)
+        buttons.addWidget(add_btn)
+        remove_btn = QPushButton("Remove Selected")
+        self._remove_mapper.setMapping(remove_btn, view)
+        remove_btn.clicked.connect(self._remove_mapper.map)
+        buttons.addWidget(remove_btn)
+        buttons.addStretch()
+        return buttons
+
+    def add_field(self, form, label_text, attr):
         edit = QLineEdit()
-        layout.addWidget(label)
-        layout.addWidget(edit)
+        edit.editingFinished.connect(
+            lambda: setattr(self.project, attr, edit.text()))
+        form.addRow(label_text, edit)
         return edit
 
+    def add_flag(self, layout, text, attr):
+        checkbox = QCheckBox(text)
+        checkbox.toggled.connect(
+            lambda checked: setattr(self.project, attr, checked))
+        layout.addWidget(checkbox)
+        return checkbox
+
     def update_ui_from_project(self):
-        # Update basic info
-        self.name_edit.setText(self.project.name)
-        self.mod_guid_edit.setText(self.project.mod_guid)
-        self.version_edit.setText(self.project.version)
-        self.teaser_edit.setText(self.project.teaser)
-        self.description_edit.setText(self.project.description)
-        self.authors_edit.setText(self.project.authors)
-        self.homepage_edit.setText(self.project.homepage)
-
-        # Update flags
-        self.affects_saves_cb.setChecked(self.project.affects_saves)
-        self.supports_sp_cb.setChecked(self.project.supports_singleplayer)
-        self.supports_mp_cb.setChecked(self.project.supports_multiplayer)
-        self.supports_hotseat_cb.setChecked(self.project.supports_hotseat)
-        self.supports_mac_cb.setChecked(self.project.supports_mac)
-        self.hide_setup_cb.setChecked(self.project.hide_setup_game)
-
-        # Clear and rebuild lists
-        self.clear_layout(self.deps_list)
-        self.clear_layout(self.blocks_list)
-        self.clear_layout(self.files_list)
-        self.clear_layout(self.actions_list)
-        self.clear_layout(self.entry_points_list)
-
-        # Rebuild dependencies
-        for dep in self.project.dependencies:
-            self.add_dependency_widget(dep)
-
-        # Rebuild blockers
-        for block in self.project.blockers:
-            self.add_blocker_widget(block)
-
-        # Rebuild files
-        for file in self.project.files:
-            self.add_file_widget(file)
-
-        # Rebuild actions
-        for action in self.project.actions:
-            self.add_action_widget(action)
-
-        # Rebuild entry points
-        for ep in self.project.entry_points:
-            self.add_entry_point_widget(ep)
-
-    def update_project_from_ui(self):
-        # Update basic info
-        self.project.name = self.name_edit.text()
-        self.project.mod_guid = self.mod_guid_edit.text()
-        self.project.version = self.version_edit.text()
-        self.project.teaser = self.teaser_edit.text()
-        self.project.description = self.description_edit.toPlainText()
-        self.project.authors = self.authors_edit.text()
-        self.project.homepage = self.homepage_edit.text()
-
-        # Update flags
-        self.project.affects_saves = self.affects_saves_cb.isChecked()
-        self.project.supports_singleplayer = self.supports_sp_cb.isChecked()
-        self.project.supports_multiplayer = self.supports_mp_cb.isChecked()
-        self.project.supports_hotseat = self.supports_hotseat_cb.isChecked()
-        self.project.supports_mac = self.supports_mac_cb.isChecked()
-        self.project.hide_setup_game = self.hide_setup_cb.isChecked()
+        # Repaint and relayout once after everything has been refreshed
+        central = self.centralWidget()
+        central.setUpdatesEnabled(False)
+        try:
+            # Update basic info
+            self.name_edit.setText(self.project.name)
+            self.mod_guid_edit.setText(self.project.mod_guid)
+            self.version_edit.setText(self.project.version)
+            self.teaser_edit.setText(self.project.teaser)
+            self.description_edit.setText(self.project.description)
+            self.authors_edit.setText(self.project.authors)
+            self.homepage_edit.setText(self.project.homepage)
+
+            # Update flags
+            self.affects_saves_cb.setChecked(self.project.affects_saves)
+            self.supports_sp_cb.setChecked(self.project.supports_singleplayer)
+            self.supports_mp_cb.setChecked(self.project.supports_multiplayer)
+            self.supports_hotseat_cb.setChecked(self.project.supports_hotseat)
+            self.supports_mac_cb.setChecked(self.project.supports_mac)
+            self.hide_setup_cb.setChecked(self.project.hide_setup_game)
+
+            # Point the list models at the project's lists
+            self.deps_model.set_items(self.project.dependencies)
+            self.blocks_model.set_items(self.project.blockers)
+            self.files_model.set_items(self.project.files)
+            self.actions_model.set_items(self.project.actions)
+            self.entry_points_model.set_items(self.project.entry_points)
+            central.layout().activate()
+        finally:
+            central.setUpdatesEnabled(True)
+
+    def _pick(self, mode, caption, name_filter="All Files (*)"):
+        """Ask for a file with the shared dialog; return its path or ""."""
+        dlg = self._file_dlg
+        dlg.setAcceptMode(mode)
+        dlg.setFileMode(QFileDialog.FileMode.ExistingFile
+                        if mode == QFileDialog.AcceptMode.AcceptOpen
+                        else QFileDialog.FileMode.AnyFile)
+        dlg.setWindowTitle(caption)
+        dlg.setNameFilter(name_filter)
+        dlg.selectFile("")
+        if dlg.exec() != QFileDialog.DialogCode.Accepted:
+            return ""
+        files = dlg.selectedFiles()
+        return files[0] if files else ""
 
     @staticmethod
-    def clear_layout(layout):
-        while layout.count():
-            child = layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+    def _load_cached(path, parser):
+        """Parse path with parser, reusing the cached result if it is unchanged."""
+        st = path.stat()
+        # Named <source>-<state>.pkl, so that older caches of the same source
+        # can be found and removed when it changes
+        source = (parser.__name__, str(path.resolve()))
+        state = (CACHE_VERSION, __version__, st.st_mtime_ns, st.st_size)
+        source_id = hashlib.sha1(repr(source).encode()).hexdigest()[:20]
+        state_id = hashlib.sha1(repr(state).encode()).hexdigest()[:20]
+        cache_file = CACHE_DIR / f"{source_id}-{state_id}.pkl"
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache {cache_file}: {e}")
+
+        project = parser(path)
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp")
+            with open(tmp_file, "wb") as f:
+                pickle.dump(project, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning(f"Could not write cache {cache_file}: {e}")
+            return project
+
+        # Drop stale caches of this source
+        for old_file in CACHE_DIR.glob(source_id + "-*.pkl"):
+            if old_file != cache_file:
+                try:
+                    old_file.unlink()
+                except OSError:
+                    pass
+        return project
+
+    def _run_job(self, job, on_success, error_text):
+        """Run job on the thread pool, then call on_success(result) back on the GUI thread."""
+        self._set_busy(True)
+        self._job_success = on_success
+        self._job_error_text = error_text
+        self._job = _Worker(job)
+        self._job.signals.finished.connect(self._job_finished)
+        self._job.signals.failed.connect(self._job_failed)
+        QThreadPool.globalInstance().start(self._job)
+
+    def _set_busy(self, busy):
+        # The project tabs are locked too, so nothing edits the project
+        # while a job is loading or saving it
+        for widget in (self.load_modinfo_btn, self.load_civ5proj_btn,
+                       self.save_modinfo_btn, self.save_civ5proj_btn,
+                       self.create_solution_cb, self.tabs):
+            widget.setEnabled(not busy)
+        if busy:
+            QApplication.setOverrideCursor(Qt.CursorShape.BusyCursor)
+        else:
+            QApplication.restoreOverrideCursor()
+
+    @pyqtSlot(object)
+    def _job_finished(self, result):
+        self._set_busy(False)
+        self._job = None
+        try:
+            self._job_success(result)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"{self._job_error_text}: {e}")
+
+    @pyqtSlot(str)
+    def _job_failed(self, message):
+        self._set_busy(False)
+        self._job = None
+        QMessageBox.critical(self, "Error", f"{self._job_error_text}: {message}")
+
+    def _project_loaded(self, project, message):
+        self.project = project
+        self.update_ui_from_project()
+        QMessageBox.information(self, "Success", message)
 
     def load_modinfo(self):
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Open .modinfo file", "", "ModInfo Files (*.modinfo)")
+        file_path = self._pick(QFileDialog.AcceptMode.AcceptOpen,
+                               "Open .modinfo file", self.MODINFO_FILTER)
         if file_path:
-            try:
-                self.project = ModProject.from_modinfo(Path(file_path))
-                self.update_ui_from_project()
-                QMessageBox.information(self, "Success", "ModInfo file loaded successfully")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to load ModInfo file: {e}")
+            path = Path(file_path)
+            self._run_job(
+                lambda: self._load_cached(path, ModProject.from_modinfo),
+                lambda project: self._project_loaded(project, "ModInfo file loaded successfully"),
+                "Failed to load ModInfo file")
 
     def load_civ5proj(self):
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Open .civ5proj file", "", "Civ5Proj Files (*.civ5proj)")
+        file_path = self._pick(QFileDialog.AcceptMode.AcceptOpen,
+                               "Open .civ5proj file", self.CIV5PROJ_FILTER)
         if file_path:
-            try:
-                self.project = ModProject.from_civ5proj(Path(file_path))
-                self.update_ui_from_project()
-                QMessageBox.information(self, "Success", "Civ5Proj file loaded successfully")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to load Civ5Proj file: {e}")
+            path = Path(file_path)
+            self._run_job(
+                lambda: self._load_cached(path, ModProject.from_civ5proj),
+                lambda project: self._project_loaded(project, "Civ5Proj file loaded successfully"),
+                "Failed to load Civ5Proj file")
 
     def save_modinfo(self):
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Save .modinfo file", "", "ModInfo Files (*.modinfo)")
+        file_path = self._pick(QFileDialog.AcceptMode.AcceptSave,
+                               "Save .modinfo file", self.MODINFO_FILTER)
         if file_path:
-            try:
-                self.update_project_from_ui()
-                self.project.write_modinfo(Path(file_path))
-                QMessageBox.information(self, "Success", "ModInfo file saved successfully")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save ModInfo file: {e}")
+            # Save a snapshot, so the worker never sees a half-edited project
+            project = copy.deepcopy(self.project)
+            path = Path(file_path)
+            self._run_job(
+                lambda: project.write_modinfo(path),
+                lambda _: QMessageBox.information(self, "Success", "ModInfo file saved successfully"),
+                "Failed to save ModInfo file")
 
     def save_civ5proj(self):
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Save .civ5proj file", "", "Civ5Proj Files (*.civ5proj)")
+        file_path = self._pick(QFileDialog.AcceptMode.AcceptSave,
+                               "Save .civ5proj file", self.CIV5PROJ_FILTER)
         if file_path:
-            try:
-                self.update_project_from_ui()
-                create_solution = self.create_solution_cb.isChecked()
-                output_path = Path(file_path)
-                self.project.write_civ5proj(output_path, create_solution=create_solution)
-                
-                msg = "Civ5Proj file saved successfully"
-                if create_solution:
-                    msg += f"\nSolution file created/updated: {output_path.with_suffix('.civ5sln')}"
-                QMessageBox.information(self, "Success", msg)
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save Civ5Proj file: {e}")
+            project = copy.deepcopy(self.project)
+            create_solution = self.create_solution_cb.isChecked()
+            output_path = Path(file_path)
+
+            msg = "Civ5Proj file saved successfully"
+            if create_solution:
+                msg += f"\nSolution file created/updated: {output_path.with_suffix('.civ5sln')}"
+            self._run_job(
+                lambda: project.write_civ5proj(output_path, create_solution=create_solution),
+                lambda _: QMessageBox.information(self, "Success", msg),
+                "Failed to save Civ5Proj file")
 
     def add_dependency(self):
-        dep = Association(type="Game")
-        self.project.dependencies.append(dep)
-        self.add_dependency_widget(dep)
+        self.deps_model.append(Association(type="Game"))
 
     def add_blocker(self):
-        block = Association(type="Mod")
-        self.project.blockers.append(block)
-        self.add_blocker_widget(block)
+        self.blocks_model.append(Association(type="Mod"))
 
     def add_file(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select file to add")
+        file_path = self._pick(QFileDialog.AcceptMode.AcceptOpen, "Select file to add")
         if file_path:
-            file = FileEntry(path=file_path, import_to_vfs=True)
-            self.project.files.append(file)
-            self.add_file_widget(file)
+            self.files_model.append(FileEntry(path=file_path, import_to_vfs=True))
 
     def add_action(self):
-        action = Action(action_set="OnModActivated", action_type="UpdateDatabase", filename="")
-        self.project.actions.append(action)
-        self.add_action_widget(action)
+        self.actions_model.append(
+            Action(action_set="OnModActivated", action_type="UpdateDatabase", filename=""))
 
     def add_entry_point(self):
-        ep = EntryPoint(type="InGameUIAddin", file="")
-        self.project.entry_points.append(ep)
-        self.add_entry_point_widget(ep)
-
-    def add_dependency_widget(self, dep):
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        
-        type_edit = QLineEdit(dep.type)
-        name_edit = QLineEdit(dep.name)
-        id_edit = QLineEdit(dep.id)
-        min_ver_edit = QLineEdit(dep.min_version)
-        max_ver_edit = QLineEdit(dep.max_version)
-        
-        layout.addWidget(QLabel("Type:"))
-        layout.addWidget(type_edit)
-        layout.addWidget(QLabel("Name:"))
-        layout.addWidget(name_edit)
-        layout.addWidget(QLabel("ID:"))
-        layout.addWidget(id_edit)
-        layout.addWidget(QLabel("Min Ver:"))
-        layout.addWidget(min_ver_edit)
-        layout.addWidget(QLabel("Max Ver:"))
-        layout.addWidget(max_ver_edit)
-        
-        remove_btn = QPushButton("Remove")
-        remove_btn.clicked.connect(lambda: self.remove_dependency(widget, dep))
-        layout.addWidget(remove_btn)
-        
-        self.deps_list.addWidget(widget)
-
-    def add_blocker_widget(self, block):
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        
-        name_edit = QLineEdit(block.name)
-        id_edit = QLineEdit(block.id)
-        min_ver_edit = QLineEdit(block.min_version)
-        max_ver_edit = QLineEdit(block.max_version)
-        
-        layout.addWidget(QLabel("Name:"))
-        layout.addWidget(name_edit)
-        layout.addWidget(QLabel("ID:"))
-        layout.addWidget(id_edit)
-        layout.addWidget(QLabel("Min Ver:"))
-        layout.addWidget(min_ver_edit)
-        layout.addWidget(QLabel("Max Ver:"))
-        layout.addWidget(max_ver_edit)
-        
-        remove_btn = QPushButton("Remove")
-        remove_btn.clicked.connect(lambda: self.remove_blocker(widget, block))
-        layout.addWidget(remove_btn)
-        
-        self.blocks_list.addWidget(widget)
-
-    def add_file_widget(self, file):
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        
-        path_edit = QLineEdit(file.path)
-        import_cb = QCheckBox("Import to VFS")
-        import_cb.setChecked(file.import_to_vfs)
-        
-        layout.addWidget(path_edit)
-        layout.addWidget(import_cb)
-        
-        remove_btn = QPushButton("Remove")
-        remove_btn.clicked.connect(lambda: self.remove_file(widget, file))
-        layout.addWidget(remove_btn)
-        
-        self.files_list.addWidget(widget)
-
-    def add_action_widget(self, action):
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        
-        set_edit = QLineEdit(action.action_set)
-        type_edit = QLineEdit(action.action_type)
-        file_edit = QLineEdit(action.filename)
-        
-        layout.addWidget(QLabel("Set:"))
-        layout.addWidget(set_edit)
-        layout.addWidget(QLabel("Type:"))
-        layout.addWidget(type_edit)
-        layout.addWidget(QLabel("File:"))
-        layout.addWidget(file_edit)
-        
-        remove_btn = QPushButton("Remove")
-        remove_btn.clicked.connect(lambda: self.remove_action(widget, action))
-        layout.addWidget(remove_btn)
-        
-        self.actions_list.addWidget(widget)
+        self.entry_points_model.append(EntryPoint(type="InGameUIAddin", file=""))
 
-    def add_entry_point_widget(self, ep):
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        
-        type_edit = QLineEdit(ep.type)
-        file_edit = QLineEdit(ep.file)
-        name_edit = QLineEdit(ep.name)
-        desc_edit = QLineEdit(ep.description)
-        
-        layout.addWidget(QLabel("Type:"))
-        layout.addWidget(type_edit)
-        layout.addWidget(QLabel("File:"))
-        layout.addWidget(file_edit)
-        layout.addWidget(QLabel("Name:"))
-        layout.addWidget(name_edit)
-        layout.addWidget(QLabel("Desc:"))
-        layout.addWidget(desc_edit)
-        
-        remove_btn = QPushButton("Remove")
-        remove_btn.clicked.connect(lambda: self.remove_entry_point(widget, ep))
-        layout.addWidget(remove_btn)
-        
-        self.entry_points_list.addWidget(widget)
-
-    def remove_dependency(self, widget, dep):
-        self.project.dependencies.remove(dep)
-        widget.deleteLater()
-
-    def remove_blocker(self, widget, block):
-        self.project.blockers.remove(block)
-        widget.deleteLater()
-
-    def remove_file(self, widget, file):
-        self.project.files.remove(file)
-        widget.deleteLater()
-
-    def remove_action(self, widget, action):
-        self.project.actions.remove(action)
-        widget.deleteLater()
-
-    def remove_entry_point(self, widget, ep):
-        self.project.entry_points.remove(ep)
-        widget.deleteLater()
+    @staticmethod
+    def remove_selected(view):
+        rows = {index.row() for index in view.selectionModel().selectedRows()}
+        view.model().remove_rows(rows)
 
 def main():
+    logging.basicConfig(level=logging.INFO)
     app = QApplication(sys.argv)
     window = ModToolsWindow()
     window.show()
@@ -4,6 +4,7 @@ setup(
     name="modtools",
     version="1.0.0",
     packages=find_packages(),
+    python_requires=">=3.10",
     install_requires=[
         "PyQt6>=6.4.0",
     ],
@@ -11,6 +12,9 @@ setup(
         'dev': [
             'pytest>=8.3.0',
         ],
+        'lxml': [
+            'lxml>=4.9',
+        ],
     },
     entry_points={
         'console_scripts': [
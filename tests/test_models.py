@@ -1,10 +1,26 @@
+from collections import Counter
+import copy
+import json
+import os
 import unittest
+from operator import attrgetter
+from unittest.mock import patch
 from pathlib import Path
 import tempfile
 import shutil
 import xml.etree.ElementTree as ET
+from modtools.core import models
 from modtools.core.models import ModProject, FileEntry, Association, Action, EntryPoint
 
+# Keys for matching up loaded items
+_path_key = attrgetter("path")
+_dep_key = attrgetter("type", "id")
+_action_key = attrgetter("action_set", "action_type", "filename")
+
+def _by(items, key):
+    """Index items by key, so two lists can be compared without sorting."""
+    return {key(item): item for item in items}
+
 class TestModProject(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -12,6 +28,10 @@ class TestModProject(unittest.TestCase):
         cls.test_data = Path(__file__).parent / "data"
         cls.modinfo_path = cls.test_data / "(1) Community Patch (v 139).modinfo"
         cls.civ5proj_path = cls.test_data / "Community Patch.civ5proj"
+
+        # Parse the sample projects once; tests work on deep copies
+        cls.modinfo_project = ModProject.from_modinfo(cls.modinfo_path)
+        cls.civ5proj_project = ModProject.from_civ5proj(cls.civ5proj_path)
         
         # Create temp directory for output files
         cls.temp_dir = Path(tempfile.mkdtemp())
@@ -23,7 +43,7 @@ class TestModProject(unittest.TestCase):
 
     def test_load_modinfo(self):
         """Test loading a .modinfo file."""
-        project = ModProject.from_modinfo(self.modinfo_path)
+        project = copy.deepcopy(self.modinfo_project)
         
         # Check basic properties
         self.assertEqual(project.name, "(1) Community Patch")
@@ -52,7 +72,7 @@ class TestModProject(unittest.TestCase):
 
     def test_load_civ5proj(self):
         """Test loading a .civ5proj file."""
-        project = ModProject.from_civ5proj(self.civ5proj_path)
+        project = copy.deepcopy(self.civ5proj_project)
         
         # Check basic properties
         self.assertEqual(project.name, "(1) Community Patch")
@@ -77,12 +97,10 @@ class TestModProject(unittest.TestCase):
     def test_modinfo_roundtrip(self):
         """Test loading and saving a .modinfo file preserves data."""
         # Load original
-        original = ModProject.from_modinfo(self.modinfo_path)
+        original = copy.deepcopy(self.modinfo_project)
         
         # Save and reload
-        temp_path = self.temp_dir / "test_roundtrip.modinfo"
-        original.write_modinfo(temp_path)
-        reloaded = ModProject.from_modinfo(temp_path)
+        reloaded = ModProject.loads_modinfo(original.dumps_modinfo(self.temp_dir))
         
         # Compare properties
         self.assertEqual(original.name, reloaded.name)
@@ -102,44 +120,36 @@ class TestModProject(unittest.TestCase):
         
         # Compare files
         self.assertEqual(len(original.files), len(reloaded.files))
-        for orig_file, new_file in zip(
-            sorted(original.files, key=lambda x: x.path),
-            sorted(reloaded.files, key=lambda x: x.path)
-        ):
-            self.assertEqual(orig_file.path, new_file.path)
+        orig_files = _by(original.files, _path_key)
+        new_files = _by(reloaded.files, _path_key)
+        self.assertEqual(orig_files.keys(), new_files.keys())
+        for path, orig_file in orig_files.items():
+            new_file = new_files[path]
             self.assertEqual(orig_file.import_to_vfs, new_file.import_to_vfs)
             # Don't compare MD5s in roundtrip test as they depend on file existence
 
         # Compare dependencies
         self.assertEqual(len(original.dependencies), len(reloaded.dependencies))
-        for orig_dep, new_dep in zip(
-            sorted(original.dependencies, key=lambda x: (x.type, x.id)),
-            sorted(reloaded.dependencies, key=lambda x: (x.type, x.id))
-        ):
-            self.assertEqual(orig_dep.type, new_dep.type)
-            self.assertEqual(orig_dep.id, new_dep.id)
+        orig_deps = _by(original.dependencies, _dep_key)
+        new_deps = _by(reloaded.dependencies, _dep_key)
+        self.assertEqual(orig_deps.keys(), new_deps.keys())
+        for key, orig_dep in orig_deps.items():
+            new_dep = new_deps[key]
             self.assertEqual(orig_dep.min_version, new_dep.min_version)
             self.assertEqual(orig_dep.max_version, new_dep.max_version)
 
         # Compare actions
         self.assertEqual(len(original.actions), len(reloaded.actions))
-        for orig_action, new_action in zip(
-            sorted(original.actions, key=lambda x: (x.action_set, x.action_type, x.filename)),
-            sorted(reloaded.actions, key=lambda x: (x.action_set, x.action_type, x.filename))
-        ):
-            self.assertEqual(orig_action.action_set, new_action.action_set)
-            self.assertEqual(orig_action.action_type, new_action.action_type)
-            self.assertEqual(orig_action.filename, new_action.filename)
+        self.assertEqual(Counter(map(_action_key, original.actions)),
+                         Counter(map(_action_key, reloaded.actions)))
 
     def test_civ5proj_roundtrip(self):
         """Test loading and saving a .civ5proj file preserves data."""
         # Load original
-        original = ModProject.from_civ5proj(self.civ5proj_path)
+        original = copy.deepcopy(self.civ5proj_project)
         
         # Save and reload
-        temp_path = self.temp_dir / "test_roundtrip.civ5proj"
-        original.write_civ5proj(temp_path, create_solution=False)
-        reloaded = ModProject.from_civ5proj(temp_path)
+        reloaded = ModProject.loads_civ5proj(original.dumps_civ5proj())
         
         # Compare properties
         self.assertEqual(original.name, reloaded.name)
@@ -159,44 +169,36 @@ class TestModProject(unittest.TestCase):
         
         # Compare files
         self.assertEqual(len(original.files), len(reloaded.files))
-        for orig_file, new_file in zip(
-            sorted(original.files, key=lambda x: x.path),
-            sorted(reloaded.files, key=lambda x: x.path)
-        ):
-            self.assertEqual(orig_file.path, new_file.path)
+        orig_files = _by(original.files, _path_key)
+        new_files = _by(reloaded.files, _path_key)
+        self.assertEqual(orig_files.keys(), new_files.keys())
+        for path, orig_file in orig_files.items():
+            new_file = new_files[path]
             self.assertEqual(orig_file.import_to_vfs, new_file.import_to_vfs)
             self.assertEqual(orig_file.type, new_file.type)
 
         # Compare dependencies
         self.assertEqual(len(original.dependencies), len(reloaded.dependencies))
-        for orig_dep, new_dep in zip(
-            sorted(original.dependencies, key=lambda x: (x.type, x.id)),
-            sorted(reloaded.dependencies, key=lambda x: (x.type, x.id))
-        ):
-            self.assertEqual(orig_dep.type, new_dep.type)
-            self.assertEqual(orig_dep.id, new_dep.id)
+        orig_deps = _by(original.dependencies, _dep_key)
+        new_deps = _by(reloaded.dependencies, _dep_key)
+        self.assertEqual(orig_deps.keys(), new_deps.keys())
+        for key, orig_dep in orig_deps.items():
+            new_dep = new_deps[key]
             self.assertEqual(orig_dep.min_version, new_dep.min_version)
             self.assertEqual(orig_dep.max_version, new_dep.max_version)
 
         # Compare actions
         self.assertEqual(len(original.actions), len(reloaded.actions))
-        for orig_action, new_action in zip(
-            sorted(original.actions, key=lambda x: (x.action_set, x.action_type, x.filename)),
-            sorted(reloaded.actions, key=lambda x: (x.action_set, x.action_type, x.filename))
-        ):
-            self.assertEqual(orig_action.action_set, new_action.action_set)
-            self.assertEqual(orig_action.action_type, new_action.action_type)
-            self.assertEqual(orig_action.filename, new_action.filename)
+        self.assertEqual(Counter(map(_action_key, original.actions)),
+                         Counter(map(_action_key, reloaded.actions)))
 
     def test_cross_conversion(self):
         """Test converting between .modinfo and .civ5proj preserves essential data."""
         # Load from modinfo
-        from_modinfo = ModProject.from_modinfo(self.modinfo_path)
+        from_modinfo = copy.deepcopy(self.modinfo_project)
         
         # Save as civ5proj and reload
-        temp_proj_path = self.temp_dir / "cross_test.civ5proj"
-        from_modinfo.write_civ5proj(temp_proj_path, create_solution=False)
-        from_proj = ModProject.from_civ5proj(temp_proj_path)
+        from_proj = ModProject.loads_civ5proj(from_modinfo.dumps_civ5proj())
         
         # Compare essential properties
         self.assertEqual(from_modinfo.name, from_proj.name)
@@ -232,10 +234,7 @@ class TestModProject(unittest.TestCase):
 
     def test_path_normalization(self):
         """Test path normalization between Windows and Unix style."""
-        project = ModProject.from_civ5proj(self.civ5proj_path)
-        
-        # Save with different path styles
-        temp_path = self.temp_dir / "path_test.civ5proj"
+        project = copy.deepcopy(self.civ5proj_project)
         
         # Add test files with different path styles
         project.files.extend([
@@ -243,10 +242,12 @@ class TestModProject(unittest.TestCase):
             FileEntry(path="test\\windows\\style.xml", import_to_vfs=True),
             FileEntry(path="mixed/path\\style.xml", import_to_vfs=True)
         ])
-        
+        self.assertEqual([f.path for f in project.files[-3:]], [
+            "test\\unix\\style.xml", "test\\windows\\style.xml", "mixed\\path\\style.xml"
+        ])
+
         # Save and reload
-        project.write_civ5proj(temp_path, create_solution=False)
-        reloaded = ModProject.from_civ5proj(temp_path)
+        reloaded = ModProject.loads_civ5proj(project.dumps_civ5proj())
         
         # Check all paths use Windows style
         for file in reloaded.files:
@@ -255,5 +256,192 @@ class TestModProject(unittest.TestCase):
                 self.assertTrue(file.path.replace("\\", "/").count("/") == file.path.count("\\"),
                               f"Mixed path separators found: {file.path}")
 
+    def test_modinfo_md5(self):
+        """Test VFS files are hashed, including when hashed in parallel."""
+        base = self.temp_dir / "md5_test"
+        base.mkdir()
+        project = ModProject(name="MD5 Test")
+        for i in range(6):
+            (base / f"file{i}.xml").write_text(f"<Data>{i}</Data>")
+            project.files.append(FileEntry(path=f"file{i}.xml", import_to_vfs=True))
+        project.files.append(FileEntry(path="missing.xml", import_to_vfs=True))
+        project.files.append(FileEntry(path="file0.xml", import_to_vfs=False))
+
+        files = project.to_modinfo(base).find("Files")
+        hashed = {f.text: f.get("md5") for f in files if f.get("import") == "1"}
+        expected = {f"file{i}.xml": FileEntry.calculate_md5(str(base / f"file{i}.xml"))
+                    for i in range(6)}
+        expected["missing.xml"] = None
+        self.assertEqual(hashed, expected)
+        self.assertEqual([f.get("md5") for f in files if f.get("import") == "0"], [None])
+
+    def test_modinfo_md5_cache(self):
+        """Test unchanged files reuse the hash cached by the previous export."""
+        base = self.temp_dir / "md5_cache_test"
+        base.mkdir()
+        data_file = base / "data.xml"
+        data_file.write_text("<Data/>")
+        project = ModProject(name="MD5 Cache Test",
+                             files=[FileEntry(path="data.xml", import_to_vfs=True)])
+
+        def exported_md5(rehash=False):
+            output_path = base / "out.modinfo"
+            project.write_modinfo(output_path, rehash=rehash)
+            return ET.parse(output_path).find("Files/File").get("md5")
+
+        # Serializing in memory leaves the mod directory alone
+        cache_path = ModProject._md5_cache_path(base)
+        project.dumps_modinfo(base)
+        self.assertFalse(cache_path.exists())
+
+        self.assertEqual(exported_md5(), FileEntry.calculate_md5(str(data_file)))
+        self.assertTrue(cache_path.exists())
+
+        # An unchanged file is not hashed again
+        cache = json.loads(cache_path.read_text())
+        cache["data.xml"][2] = "CACHED"
+        cache_path.write_text(json.dumps(cache))
+        self.assertEqual(exported_md5(), "CACHED")
+
+        # Unless a rehash is forced, which also replaces the cached hash
+        self.assertEqual(exported_md5(rehash=True), FileEntry.calculate_md5(str(data_file)))
+        self.assertEqual(exported_md5(), FileEntry.calculate_md5(str(data_file)))
+
+        # A changed file is
+        data_file.write_text("<Data>changed</Data>")
+        self.assertEqual(exported_md5(), FileEntry.calculate_md5(str(data_file)))
+
+    def test_modinfo_md5_cache_cleanup(self):
+        """Test malformed cache entries are rehashed and removed files pruned."""
+        base = self.temp_dir / "md5_cache_cleanup_test"
+        base.mkdir()
+        for name in ("a.xml", "b.xml"):
+            (base / name).write_text(f"<{name[0]}/>")
+        cache_path = ModProject._md5_cache_path(base)
+        cache_path.write_text(json.dumps({"a.xml": 5, "b.xml": {"md5": "X"}, "gone.xml": [1, 2, "X"]}))
+        project = ModProject(name="MD5 Cleanup Test", files=[
+            FileEntry(path="a.xml", import_to_vfs=True),
+            FileEntry(path="b.xml", import_to_vfs=True),
+        ])
+
+        output_path = base / "out.modinfo"
+        project.write_modinfo(output_path)
+        md5s = [f.get("md5") for f in ET.parse(output_path).find("Files")]
+        self.assertEqual(md5s, [FileEntry.calculate_md5(str(base / name))
+                                for name in ("a.xml", "b.xml")])
+        self.assertEqual(sorted(json.loads(cache_path.read_text())), ["a.xml", "b.xml"])
+
+        # Dropping a file from the project drops its cache entry
+        del project.files[1]
+        project.write_modinfo(output_path)
+        self.assertEqual(list(json.loads(cache_path.read_text())), ["a.xml"])
+
+    def test_modinfo_unreadable_file_logged(self):
+        """Test only missing files are reported as not found."""
+        project = ModProject(name="Stat Error Test", files=[
+            FileEntry(path="missing.xml", import_to_vfs=True),
+        ])
+        with self.assertLogs(models.logger, "WARNING") as logs:
+            project.to_modinfo(self.temp_dir)
+        self.assertIn("File not found", logs.output[0])
+
+        with patch.object(models.os, "stat", side_effect=PermissionError("Permission denied")), \
+                self.assertLogs(models.logger, "WARNING") as logs:
+            project.to_modinfo(self.temp_dir)
+        self.assertNotIn("File not found", logs.output[0])
+        self.assertIn("Permission denied", logs.output[0])
+
+    def test_modinfo_md5_shared_file(self):
+        """Test a file reached through several paths is hashed once."""
+        base = self.temp_dir / "md5_link_test"
+        base.mkdir()
+        (base / "icon.dds").write_bytes(b"DDS data")
+        try:
+            os.link(base / "icon.dds", base / "alias.dds")
+        except OSError:
+            self.skipTest("hard links not supported")
+        project = ModProject(name="Link Test", files=[
+            FileEntry(path="icon.dds", import_to_vfs=True),
+            FileEntry(path="alias.dds", import_to_vfs=True),
+        ])
+
+        with patch.object(ModProject, "_hash_files", wraps=ModProject._hash_files) as hash_files:
+            files = project.to_modinfo(base).find("Files")
+        self.assertEqual(len(list(hash_files.call_args.args[0])), 1)
+        expected = FileEntry.calculate_md5(str(base / "icon.dds"))
+        self.assertEqual([f.get("md5") for f in files], [expected, expected])
+
+    def _modinfo_with_entity_description(self, target: Path) -> str:
+        """Get the sample .modinfo with its Description read from an external entity."""
+        text = self.modinfo_path.read_text(encoding="utf-8-sig")
+        text = text.replace(
+            '<?xml version="1.0" encoding="utf-8"?>',
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            f'<!DOCTYPE Mod [<!ENTITY x SYSTEM "{target.as_uri()}">]>', 1)
+        start = text.index("<Description>") + len("<Description>")
+        return text[:start] + "&x;" + text[text.index("</Description>"):]
+
+    def test_external_entities_not_resolved(self):
+        """Test lxml never resolves entities or fetches from the network."""
+        if models._lxml_etree is None:
+            self.skipTest("lxml not installed")
+        secret = self.temp_dir / "secret.txt"
+        secret.write_text("SECRET CONTENTS")
+        text = self._modinfo_with_entity_description(secret)
+
+        lxml_iterparse = models._lxml_etree.iterparse
+        with patch.object(models._lxml_etree, "iterparse", wraps=lxml_iterparse) as iterparse:
+            project = ModProject.loads_modinfo(text)
+        self.assertIs(iterparse.call_args.kwargs.get("resolve_entities"), False)
+        self.assertIs(iterparse.call_args.kwargs.get("no_network"), True)
+        self.assertNotIn("SECRET", project.description or "")
+
+    def test_external_entities_rejected_without_lxml(self):
+        """Test ElementTree rejects external entities outright."""
+        secret = self.temp_dir / "secret_et.txt"
+        secret.write_text("SECRET CONTENTS")
+        text = self._modinfo_with_entity_description(secret)
+
+        with patch.object(models, "_lxml_etree", None):
+            with self.assertRaises(ET.ParseError):
+                ModProject.loads_modinfo(text)
+
+    def test_entity_reference_between_elements(self):
+        """Test an unresolved entity reference between elements is skipped."""
+        if models._lxml_etree is None:
+            self.skipTest("lxml not installed; ElementTree rejects the entity")
+        secret = self.temp_dir / "entity.txt"
+        secret.write_text("ENTITY CONTENTS")
+        text = self.civ5proj_path.read_text(encoding="utf-8-sig")
+        text = text.replace(
+            '<?xml version="1.0" encoding="utf-8"?>',
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            f'<!DOCTYPE Project [<!ENTITY x SYSTEM "{secret.as_uri()}">]>', 1)
+        text = text.replace("<ModDependencies>", "<ModDependencies>&x;", 1)
+
+        project = ModProject.loads_civ5proj(text)
+        self.assertEqual(project.dependencies, self.civ5proj_project.dependencies)
+
+    def test_write_golden(self):
+        """Test written files match the expected layout byte for byte."""
+        project = ModProject(
+            name="Golden", project_guid="{P}", mod_guid="{M}",
+            teaser="T & t", description="D",
+            dependencies=[Association(type="Game")],
+            files=[FileEntry(path="XML/a.xml", import_to_vfs=False)],
+            actions=[Action(action_set="OnModActivated", action_type="UpdateDatabase",
+                            filename="XML/a.xml")],
+            entry_points=[EntryPoint(type="InGameUIAddin", file="Lua/b.lua", name="B")],
+        )
+        out_dir = self.temp_dir / "golden"
+        out_dir.mkdir()
+        project.write_modinfo(out_dir / "Golden (v 1).modinfo")
+        project.write_civ5proj(out_dir / "Golden.civ5proj", create_solution=False)
+
+        # Files are written with the platform's line endings
+        for name in ("Golden (v 1).modinfo", "Golden.civ5proj"):
+            expected = (self.test_data / name).read_bytes().replace(b"\n", os.linesep.encode())
+            self.assertEqual((out_dir / name).read_bytes(), expected, name)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -150,4 +150,10 @@ class TestPaths(unittest.TestCase):
         # Test relative paths
         sub_dir = self.temp_dir / "Assets"
         files = list_mod_files(sub_dir, relative_to=self.temp_dir)
-        self.assertEqual(files, ["Assets\\UI\\test.dds"])
\ No newline at end of file
+        self.assertEqual(files, ["Assets\\UI\\test.dds"])
+
+        # Test extension filter
+        self.assertEqual(list_mod_files(self.temp_dir, extensions={"SQL"}),
+                         ["Database Changes\\SQL\\test.sql"])
+        self.assertEqual(list_mod_files(self.temp_dir, extensions=[".dds", "lua"]),
+                         ["Assets\\UI\\test.dds"])
\ No newline at end of file
@@ -35,6 +35,43 @@ class TestModSolution(unittest.TestCase):
         self.assertEqual(proj.path, "Community Patch.civ5proj")
         self.assertEqual(proj.guid.lower(), "{0d66d522-b624-4bc5-acfe-15a0c5b729f4}")
 
+    def test_load_solution_skips_foreign_projects(self):
+        """Test that only ModBuddy projects are loaded from a solution."""
+        temp_path = self.temp_dir / "foreign_test.civ5sln"
+        temp_path.write_text(
+            "\n"
+            "Microsoft Visual Studio Solution File, Format Version 11.00\n"
+            'Project("{8BC9CEB8-8B4A-11D0-8D11-00A0C91BC942}") = "Native", "Native.vcxproj", "{111}"\n'
+            "EndProject\n"
+            'Project("{F5FC21B5-7CC2-458A-ABBA-992F515BBA20}") = "Mod", "Mod.civ5proj", "{222}"\n'
+            "EndProject\n",
+            encoding='utf-8-sig'
+        )
+
+        solution = ModSolution.from_sln(temp_path)
+
+        # Solution name comes from the first project, whatever its type
+        self.assertEqual(solution.name, "Native")
+        self.assertEqual([p.name for p in solution.projects], ["Mod"])
+
+    def test_load_solution_without_projects(self):
+        """Test that a solution without projects is rejected."""
+        temp_path = self.temp_dir / "empty_test.civ5sln"
+        temp_path.write_text("\nGlobal\nEndGlobal\n", encoding='utf-8-sig')
+
+        with self.assertRaises(ValueError):
+            ModSolution.from_sln(temp_path)
+
+    def test_changed_guid_written_everywhere(self):
+        """Test a project GUID changed after creation is used in every section."""
+        ref = ProjectReference(path="Mod.civ5proj", name="Mod", guid="{aaaa-1111}")
+        ref.guid = "{bbbb-2222}"
+        sln = ModSolution(name="Mod", projects=[ref]).to_sln()
+
+        self.assertIn('"Mod.civ5proj", "{bbbb-2222}"', sln)
+        self.assertIn("{BBBB-2222}.Default|x86.ActiveCfg", sln)
+        self.assertNotIn("AAAA", sln.upper())
+
     def test_create_solution(self):
         """Test creating a new solution for a project."""
         project_path = Path("test_project.civ5proj")